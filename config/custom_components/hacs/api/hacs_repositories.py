@@ -1,62 +1,117 @@
 """API Handler for hacs_repositories"""
+import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from homeassistant.components import websocket_api
 
-from custom_components.hacs.share import get_hacs
+from custom_components.hacs.helpers.classes.repository_registry import SORT_KEYS
+from custom_components.hacs.share import get_hacs, get_repository_feed
 
 
 @websocket_api.async_response
 @websocket_api.websocket_command({vol.Required("type"): "hacs/repositories"})
 async def hacs_repositories(hass, connection, msg):
     """Handle get media player cover command."""
-    hacs = get_hacs()
-    repositories = hacs.repositories
-    content = []
-    for repo in repositories:
-        if repo.data.category in hacs.common.categories:
-            data = {
-                "additional_info": repo.information.additional_info,
-                "authors": repo.data.authors,
-                "available_version": repo.display_available_version,
-                "beta": repo.data.show_beta,
-                "can_install": repo.can_install,
-                "category": repo.data.category,
-                "country": repo.data.country,
-                "config_flow": repo.data.config_flow,
-                "custom": repo.custom,
-                "default_branch": repo.data.default_branch,
-                "description": repo.data.description,
-                "domain": repo.data.domain,
-                "downloads": repo.data.downloads,
-                "file_name": repo.data.file_name,
-                "first_install": repo.status.first_install,
-                "full_name": repo.data.full_name,
-                "hide": repo.data.hide,
-                "hide_default_branch": repo.data.hide_default_branch,
-                "homeassistant": repo.data.homeassistant,
-                "id": repo.data.id,
-                "info": repo.information.info,
-                "installed_version": repo.display_installed_version,
-                "installed": repo.data.installed,
-                "issues": repo.data.open_issues,
-                "javascript_type": repo.information.javascript_type,
-                "last_updated": repo.data.last_updated,
-                "local_path": repo.content.path.local,
-                "main_action": repo.main_action,
-                "name": repo.display_name,
-                "new": repo.data.new,
-                "pending_upgrade": repo.pending_upgrade,
-                "releases": repo.data.published_tags,
-                "selected_tag": repo.data.selected_tag,
-                "stars": repo.data.stargazers_count,
-                "state": repo.state,
-                "status_description": repo.display_status_description,
-                "status": repo.display_status,
-                "topics": repo.data.topics,
-                "updated_info": repo.status.updated_info,
-                "version_or_commit": repo.display_version_or_commit,
-            }
-
-            content.append(data)
-
+    content = get_repository_feed().snapshot()
     connection.send_message(websocket_api.result_message(msg["id"], content))
+
+
+@websocket_api.async_response
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "hacs/repositories/subscribe",
+        vol.Optional("revision"): int,
+    }
+)
+async def hacs_repositories_subscribe(hass, connection, msg):
+    """Subscribe to the repositories, and get what changes as it happens.
+
+    The first event has the revision and either all repositories (a
+    snapshot) or, when the revision in the request is recent enough, the
+    changes since that revision. The following events have the changed
+    fields by repository id, where None means the repository was removed.
+    """
+    feed = get_repository_feed()
+
+    def send(revision, changes):
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"], {"revision": revision, "changes": changes}
+            )
+        )
+
+    # Catch up with pending changes first, so the first event has the
+    # current revision, and only later changes go to the subscription.
+    repositories = feed.snapshot()
+    changes = None
+    if msg.get("revision") is not None:
+        changes = feed.changes_since(msg["revision"])
+
+    connection.send_message(websocket_api.result_message(msg["id"]))
+    if changes is None:
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"], {"revision": feed.revision, "repositories": repositories}
+            )
+        )
+    else:
+        send(feed.revision, changes)
+    connection.subscriptions[msg["id"]] = feed.async_subscribe(send)
+
+
+@websocket_api.async_response
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "hacs/repositories/query",
+        vol.Optional("category"): vol.Any(cv.string, [cv.string]),
+        vol.Optional("installed"): cv.boolean,
+        vol.Optional("pending_upgrade"): cv.boolean,
+        vol.Optional("new"): cv.boolean,
+        vol.Optional("hidden"): cv.boolean,
+        vol.Optional("sort", default="name"): vol.In(SORT_KEYS),
+        vol.Optional("descending", default=False): cv.boolean,
+        vol.Optional("offset", default=0): vol.All(int, vol.Range(min=0)),
+        vol.Optional("limit", default=50): vol.All(int, vol.Range(min=1, max=500)),
+    }
+)
+async def hacs_repositories_query(hass, connection, msg):
+    """Return one page of the repositories matching the filters."""
+    feed = get_repository_feed()
+    filters = {
+        "category": msg.get("category"),
+        "installed": msg.get("installed"),
+        "pending_upgrade": msg.get("pending_upgrade"),
+        "new": msg.get("new"),
+        "hide": msg.get("hidden"),
+    }
+    total, repositories = feed.query(
+        filters, msg["sort"], msg["descending"], msg["offset"], msg["limit"]
+    )
+    connection.send_message(
+        websocket_api.result_message(
+            msg["id"],
+            {"revision": feed.revision, "total": total, "repositories": repositories},
+        )
+    )
+
+
+@websocket_api.async_response
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "hacs/repositories/search",
+        vol.Required("query"): cv.string,
+        vol.Optional("category"): vol.Any(cv.string, [cv.string]),
+        vol.Optional("limit", default=20): vol.All(int, vol.Range(min=1, max=100)),
+    }
+)
+async def hacs_repositories_search(hass, connection, msg):
+    """Return the IDs of the repositories that best match a search query."""
+    hacs = get_hacs()
+    categories = msg.get("category", hacs.common.categories)
+    if isinstance(categories, str):
+        categories = [categories]
+    repositories = hacs.repositories.search(msg["query"], msg["limit"], categories)
+    connection.send_message(
+        websocket_api.result_message(
+            msg["id"], [str(repository.data.id) for repository in repositories]
+        )
+    )
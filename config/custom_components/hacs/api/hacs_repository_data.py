@@ -25,6 +25,13 @@ from custom_components.hacs.share import get_hacs
 )
 async def hacs_repository_data(hass, connection, msg):
     """Handle get media player cover command."""
+    # User actions go ahead of the background tasks in the queue.
+    async with get_hacs().queue.interactive():
+        await _async_hacs_repository_data(hass, connection, msg)
+
+
+async def _async_hacs_repository_data(hass, connection, msg):
+    """Run a repository data action."""
     hacs = get_hacs()
     logger = getLogger("api.repository_data")
     repo_id = msg.get("repository")
@@ -64,9 +71,9 @@ async def hacs_repository_data(hass, connection, msg):
                 },
             )
 
-        repository = hacs.get_by_name(repo_id)
+        repository = hacs.hydrate_repository(hacs.get_by_name(repo_id))
     else:
-        repository = hacs.get_by_id(repo_id)
+        repository = hacs.hydrate_repository(hacs.get_by_id(repo_id))
 
     if repository is None:
         hass.bus.async_fire("hacs/repository", {})
@@ -4,6 +4,9 @@ import voluptuous as vol
 from homeassistant.components import websocket_api
 
 from custom_components.hacs.helpers.functions.logger import getLogger
+from custom_components.hacs.helpers.functions.upgrade_all import (
+    async_upgrade_repositories,
+)
 from custom_components.hacs.share import get_hacs
 
 
@@ -38,6 +41,24 @@ async def hacs_settings(hass, connection, msg):
     elif action == "set_fe_compact_false":
         hacs.configuration.frontend_compact = True
 
+    elif action == "upgrade_all":
+        hacs.system.status.upgrading_all = True
+        hacs.system.status.background_task = True
+        hass.bus.async_fire("hacs/status", {})
+        try:
+            await async_upgrade_repositories(
+                [
+                    repository
+                    for repository in hacs.repositories
+                    if repository.pending_upgrade
+                ]
+            )
+        finally:
+            hacs.system.status.upgrading_all = False
+            hacs.system.status.background_task = False
+            hass.bus.async_fire("hacs/status", {})
+            hass.bus.async_fire("hacs/repository", {})
+
     elif action == "clear_new":
         for repo in hacs.repositories:
             if repo.data.new and repo.data.category in msg.get("categories", []):
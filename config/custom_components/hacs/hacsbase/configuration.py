@@ -38,6 +38,7 @@ class Configuration:
     country: str = "ALL"
     experimental: bool = False
     release_limit: int = 5
+    upgrade_concurrency: int = 4
 
     def to_json(self):
         """Return a dict representation of the configuration."""
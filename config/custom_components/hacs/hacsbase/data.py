@@ -3,16 +3,23 @@ from queueman import QueueManager
 
 from custom_components.hacs.const import VERSION
 from custom_components.hacs.helpers.classes.manifest import HacsManifest
+from custom_components.hacs.helpers.classes.repository_stub import HacsRepositoryStub
+from custom_components.hacs.helpers.classes.repositorydata import RepositoryData
 from custom_components.hacs.helpers.functions.logger import getLogger
 from custom_components.hacs.helpers.functions.register_repository import (
     register_repository,
 )
 from custom_components.hacs.helpers.functions.store import (
+    async_delay_save_to_store,
     async_load_from_store,
+    async_remove_store,
     async_save_to_store,
 )
 from custom_components.hacs.share import get_hacs
 
+# Seconds to wait for more changes before the store files are written.
+STORE_WRITE_DELAY = 10
+
 
 class HacsData:
     """HacsData class."""
@@ -23,38 +30,66 @@ class HacsData:
         self.hacs = get_hacs()
         self.queue = QueueManager()
         self.content = {}
+        self.hacs_content = {}
 
     async def async_write(self):
-        """Write content to the store files."""
+        """Write changed content to the store files.
+
+        Only repositories with dirty data are serialized again, and the saves
+        are delayed so that bursts of writes end up as one write to disk. The
+        store gets a copy, as it is encoded in an executor while self.content
+        keeps changing.
+        """
         if self.hacs.system.status.background_task or self.hacs.system.disabled:
             return
 
-        self.logger.debug("Saving data")
-
         # Hacs
-        await async_save_to_store(
-            self.hacs.hass,
-            "hacs",
-            {
-                "view": self.hacs.configuration.frontend_mode,
-                "compact": self.hacs.configuration.frontend_compact,
-                "onboarding_done": self.hacs.configuration.onboarding_done,
-            },
-        )
+        hacs_content = {
+            "view": self.hacs.configuration.frontend_mode,
+            "compact": self.hacs.configuration.frontend_compact,
+            "onboarding_done": self.hacs.configuration.onboarding_done,
+        }
+        if hacs_content != self.hacs_content:
+            self.hacs_content = hacs_content
+            async_delay_save_to_store(
+                self.hacs.hass,
+                "hacs",
+                lambda: dict(self.hacs_content),
+                STORE_WRITE_DELAY,
+            )
 
         # Repositories
-        self.content = {}
-        for repository in self.hacs.repositories or []:
-            self.queue.add(self.async_store_repository_data(repository))
-
-        await self.queue.execute()
-        await async_save_to_store(self.hacs.hass, "repositories", self.content)
+        if self.async_serialize_repositories():
+            self.logger.debug("Saving data")
+            async_delay_save_to_store(
+                self.hacs.hass,
+                "repositories",
+                lambda: dict(self.content),
+                STORE_WRITE_DELAY,
+            )
         self.hacs.hass.bus.async_fire("hacs/repository", {})
         self.hacs.hass.bus.fire("hacs/config", {})
 
-    async def async_store_repository_data(self, repository):
+    def async_serialize_repositories(self):
+        """Update self.content for changed repositories, return True on changes."""
+        changed = False
+        known = set()
+        for repository in self.hacs.repositories:
+            repository_id = str(repository.data.id)
+            known.add(repository_id)
+            if repository.data.dirty or repository_id not in self.content:
+                self.async_store_repository_data(repository)
+                changed = True
+
+        for repository_id in set(self.content) - known:
+            del self.content[repository_id]
+            changed = True
+        return changed
+
+    def async_store_repository_data(self, repository):
+        """Serialize a repository into self.content."""
         repository_manifest = repository.repository_manifest.manifest
-        if data := {
+        data = {
             "authors": repository.data.authors,
             "category": repository.data.category,
             "description": repository.data.description,
@@ -69,22 +104,20 @@ class HacsData:
             "last_updated": repository.data.last_updated,
             "name": repository.data.name,
             "new": repository.data.new,
+            "releases": repository.data.releases,
             "repository_manifest": repository_manifest,
             "selected_tag": repository.data.selected_tag,
             "show_beta": repository.data.show_beta,
             "stars": repository.data.stargazers_count,
             "topics": repository.data.topics,
             "version_installed": repository.data.installed_version,
-        }:
-            if repository.data.installed and (
-                repository.data.installed_commit or repository.data.installed_version
-            ):
-                await async_save_to_store(
-                    self.hacs.hass,
-                    f"hacs/{repository.data.id}.hacs",
-                    repository.data.to_json(),
-                )
-            self.content[str(repository.data.id)] = data
+        }
+        if repository.data.installed and (
+            repository.data.installed_commit or repository.data.installed_version
+        ):
+            data["data"] = repository.data.to_json()
+        self.content[str(repository.data.id)] = data
+        repository.data.dirty = False
 
     async def restore(self):
         """Restore saved data."""
@@ -104,57 +137,58 @@ class HacsData:
             self.hacs.configuration.onboarding_done = hacs.get("onboarding_done", False)
 
             # Repositories
+            legacy = []
             for entry in repositories or []:
                 self.queue.add(
-                    self.async_restore_repository(entry, repositories[entry])
+                    self.async_restore_repository(entry, repositories[entry], legacy)
                 )
 
             await self.queue.execute()
 
+            if legacy:
+                await self.async_migrate_legacy_stores(legacy)
+
             self.logger.info("Restore done")
         except BaseException as exception:
             self.logger.critical(f"[{exception}] Restore Failed!")
             return False
         return True
 
-    async def async_restore_repository(self, entry, repository_data):
+    async def async_migrate_legacy_stores(self, legacy):
+        """Move the per repository store files into the repositories store."""
+        self.logger.info(f"Migrating {len(legacy)} repository store files")
+        self.async_serialize_repositories()
+        await async_save_to_store(self.hacs.hass, "repositories", self.content)
+        for key in legacy:
+            await async_remove_store(self.hacs.hass, key)
+
+    async def async_restore_repository(self, entry, repository_data, legacy):
+        if (
+            not self.hacs.is_known(entry)
+            and not repository_data.get("installed")
+            and repository_data["full_name"] != "hacs/integration"
+        ):
+            self.async_restore_repository_stub(entry, repository_data)
+            return
+
         if not self.hacs.is_known(entry):
             await register_repository(
                 repository_data["full_name"], repository_data["category"], False
             )
-        repository = [
-            x
-            for x in self.hacs.repositories
-            if str(x.data.id) == str(entry)
-            or x.data.full_name == repository_data["full_name"]
-        ]
-        if not repository:
+        repository = self.hacs.get_by_id(entry) or self.hacs.get_by_name(
+            repository_data["full_name"]
+        )
+        if repository is None:
             self.logger.error(f"Did not find {repository_data['full_name']} ({entry})")
             return
 
-        repository = repository[0]
-
         # Restore repository attributes
-        repository.data.id = entry
-        repository.data.authors = repository_data.get("authors", [])
-        repository.data.description = repository_data.get("description")
+        restore_repository_data(repository.data, entry, repository_data)
+        self.hacs.repositories.reindex(repository)
         repository.releases.last_release_object_downloads = repository_data.get(
             "downloads"
         )
-        repository.data.last_updated = repository_data.get("last_updated")
-        repository.data.topics = repository_data.get("topics", [])
-        repository.data.domain = repository_data.get("domain", None)
-        repository.data.stargazers_count = repository_data.get("stars", 0)
         repository.releases.last_release = repository_data.get("last_release_tag")
-        repository.data.hide = repository_data.get("hide", False)
-        repository.data.installed = repository_data.get("installed", False)
-        repository.data.new = repository_data.get("new", True)
-        repository.data.selected_tag = repository_data.get("selected_tag")
-        repository.data.show_beta = repository_data.get("show_beta", False)
-        repository.data.last_version = repository_data.get("last_release_tag")
-        repository.data.last_commit = repository_data.get("last_commit")
-        repository.data.installed_version = repository_data.get("version_installed")
-        repository.data.installed_commit = repository_data.get("installed_commit")
 
         repository.repository_manifest = HacsManifest.from_dict(
             repository_data.get("repository_manifest", {})
@@ -167,7 +201,16 @@ class HacsData:
             repository.data.installed_version = VERSION
             repository.data.installed = True
 
-        restored = await async_load_from_store(self.hacs.hass, f"hacs/{entry}.hacs")
+        restored = repository_data.get("data")
+        migrated = False
+        if restored is None and repository.data.installed:
+            # Written before all records were kept in the repositories store.
+            restored = await async_load_from_store(
+                self.hacs.hass, f"hacs/{entry}.hacs"
+            )
+            if restored:
+                legacy.append(f"hacs/{entry}.hacs")
+                migrated = True
 
         if restored:
             repository.data.update_data(restored)
@@ -176,3 +219,41 @@ class HacsData:
                     "Should be installed but is not... Fixing that!"
                 )
                 repository.data.installed = True
+
+        if repository_data["full_name"] != "hacs/integration" and not migrated:
+            # The restored repository matches what is stored, no need to save it.
+            self.content[str(entry)] = repository_data
+            repository.data.dirty = False
+
+    def async_restore_repository_stub(self, entry, repository_data):
+        """Restore a repository that is not installed as a stub."""
+        data = RepositoryData()
+        data.full_name = repository_data["full_name"]
+        data.full_name_lower = data.full_name.lower()
+        data.category = repository_data["category"]
+        restore_repository_data(data, entry, repository_data)
+        data.dirty = False
+        self.content[str(entry)] = repository_data
+        self.hacs.repositories.add(HacsRepositoryStub(data, repository_data))
+
+
+def restore_repository_data(data, entry, repository_data):
+    """Restore the stored attributes of a repository to its RepositoryData."""
+    data.id = entry
+    data.authors = repository_data.get("authors", [])
+    data.description = repository_data.get("description")
+    data.last_updated = repository_data.get("last_updated")
+    data.topics = repository_data.get("topics", [])
+    data.domain = repository_data.get("domain", None)
+    data.stargazers_count = repository_data.get("stars", 0)
+    data.hide = repository_data.get("hide", False)
+    data.installed = repository_data.get("installed", False)
+    data.new = repository_data.get("new", True)
+    data.selected_tag = repository_data.get("selected_tag")
+    data.show_beta = repository_data.get("show_beta", False)
+    data.last_version = repository_data.get("last_release_tag")
+    # Records written before releases was stored: a release tag means releases.
+    data.releases = repository_data.get("releases", data.last_version is not None)
+    data.last_commit = repository_data.get("last_commit")
+    data.installed_version = repository_data.get("version_installed")
+    data.installed_commit = repository_data.get("installed_commit")
@@ -1,5 +1,6 @@
 """Initialize the HACS base."""
 # pylint: disable=unused-argument, bad-continuation
+import asyncio
 import json
 import uuid
 from datetime import timedelta
@@ -8,6 +9,18 @@ from aiogithubapi import AIOGitHubAPIException
 from queueman import QueueManager
 
 from custom_components.hacs.helpers import HacsHelpers
+from custom_components.hacs.helpers.classes.exceptions import HacsException
+from custom_components.hacs.helpers.classes.repository_registry import (
+    HacsRepositoryRegistry,
+)
+from custom_components.hacs.helpers.classes.task_queue import (
+    PRIORITY_CATALOGUE,
+    PRIORITY_INSTALLED,
+)
+from custom_components.hacs.helpers.functions.bulk_repository_metadata import (
+    BULK_BATCH_SIZE,
+    async_get_bulk_repository_metadata,
+)
 from custom_components.hacs.helpers.functions.get_list_from_default import (
     async_get_list_from_default,
 )
@@ -26,11 +39,13 @@ from custom_components.hacs.operational.setup_actions.categories import (
     async_setup_extra_stores,
 )
 from custom_components.hacs.share import (
+    get_default_lists,
     get_factory,
     get_queue,
     get_removed,
     is_removed,
     list_removed_repositories,
+    load_removed_repositories,
 )
 
 
@@ -80,7 +95,7 @@ class Hacs(HacsHelpers):
     action = False
     hacsweb = f"/hacsweb/{token}"
     hacsapi = f"/hacsapi/{token}"
-    repositories = []
+    repositories = HacsRepositoryRegistry()
     frontend = HacsFrontend()
     repo = None
     data_repo = None
@@ -100,38 +115,31 @@ class Hacs(HacsHelpers):
 
     def get_by_id(self, repository_id):
         """Get repository by ID."""
-        try:
-            for repository in self.repositories:
-                if str(repository.data.id) == str(repository_id):
-                    return repository
-        except BaseException:
-            pass
-        return None
+        return self.repositories.get_by_id(repository_id)
 
     def get_by_name(self, repository_full_name):
         """Get repository by full_name."""
-        try:
-            repository_full_name_lower = repository_full_name.lower()
-            for repository in self.repositories:
-                if repository.data.full_name_lower == repository_full_name_lower:
-                    return repository
-        except BaseException:
-            pass
-        return None
+        return self.repositories.get_by_name(repository_full_name)
 
     def is_known(self, repository_id):
         """Return a bool if the repository is known."""
-        return str(repository_id) in [str(x.data.id) for x in self.repositories]
+        return self.repositories.is_known(repository_id)
+
+    def hydrate_repository(self, repository):
+        """Return the full repository object for a repository or a stub."""
+        if getattr(repository, "stub", False):
+            return repository.hydrate()
+        return repository
 
     @property
     def sorted_by_name(self):
         """Return a sorted(by name) list of repository objects."""
-        return sorted(self.repositories, key=lambda x: x.display_name)
+        return self.repositories.sorted_by("name")
 
     @property
     def sorted_by_repository_name(self):
         """Return a sorted(by repository_name) list of repository objects."""
-        return sorted(self.repositories, key=lambda x: x.data.full_name)
+        return self.repositories.sorted_by("repository_name")
 
     async def register_repository(self, full_name, category, check=True):
         """Register a repository."""
@@ -147,6 +155,7 @@ class Hacs(HacsHelpers):
         await self.handle_critical_repositories()
         await self.async_load_default_repositories()
         await self.clear_out_removed_repositories()
+        self.hass.async_create_task(self.async_refresh_default_repositories())
 
         self.recuring_tasks.append(
             self.hass.helpers.event.async_track_time_interval(
@@ -281,7 +290,9 @@ class Hacs(HacsHelpers):
                 repository.data.installed
                 and repository.data.category in self.common.categories
             ):
-                self.queue.add(self.factory.safe_update(repository))
+                self.queue.add(
+                    self.factory.safe_update(repository), PRIORITY_INSTALLED
+                )
 
         await self.handle_critical_repositories()
         self.system.status.background_task = False
@@ -296,18 +307,85 @@ class Hacs(HacsHelpers):
         self.system.status.background_task = True
         self.hass.bus.async_fire("hacs/status", {})
 
-        for repository in self.repositories:
-            if repository.data.category in self.common.categories:
-                self.queue.add(self.factory.safe_common_update(repository))
+        try:
+            await self.async_bulk_update_repositories(
+                [
+                    repository
+                    for repository in self.repositories
+                    if repository.data.category in self.common.categories
+                ]
+            )
 
-        await self.async_load_default_repositories()
-        await self.clear_out_removed_repositories()
-        self.system.status.background_task = False
+            await get_default_lists().async_refresh()
+            await self.async_load_default_repositories()
+            await self.clear_out_removed_repositories()
+        finally:
+            self.system.status.background_task = False
         await self.data.async_write()
         self.hass.bus.async_fire("hacs/status", {})
         self.hass.bus.async_fire("hacs/repository", {"action": "reload"})
         self.logger.debug("Recurring background task for all repositories done")
 
+    async def async_bulk_update_repositories(self, repositories):
+        """Refresh repository metadata in batches with GraphQL.
+
+        Only repositories where the default branch head, the latest release or
+        the archived flag moved (or that GitHub could not resolve) are queued
+        for the full per repository update.
+        """
+        for index in range(0, len(repositories), BULK_BATCH_SIZE):
+            batch = repositories[index : index + BULK_BATCH_SIZE]
+            try:
+                metadata = await async_get_bulk_repository_metadata(
+                    self.session,
+                    self.configuration.token,
+                    [repository.data.full_name for repository in batch],
+                )
+            except HacsException as exception:
+                self.logger.debug(f"Bulk metadata refresh failed - {exception}")
+                metadata = {}
+
+            for repository in batch:
+                data = metadata.get(repository.data.full_name)
+                if data is None or self._repository_moved(repository, data):
+                    self.queue.add(
+                        self.factory.safe_common_update(
+                            self.hydrate_repository(repository)
+                        ),
+                        PRIORITY_INSTALLED
+                        if repository.data.installed
+                        else PRIORITY_CATALOGUE,
+                    )
+                    continue
+                repository.data.update_data(
+                    {
+                        "archived": data["archived"],
+                        "default_branch": data["default_branch"],
+                        "description": data["description"],
+                        "pushed_at": data["pushed_at"],
+                        "stargazers_count": data["stargazers_count"],
+                        "topics": data["topics"],
+                    }
+                )
+                repository.data.last_updated = data["pushed_at"]
+                self.repositories.update_indexes(repository)
+
+    @staticmethod
+    def _repository_moved(repository, data):
+        """Return True if the repository needs a full update."""
+        if data["head_sha"] != repository.data.last_commit:
+            return True
+        if data["archived"] != repository.data.archived:
+            return True
+        # latestRelease skips prereleases, which show_beta repositories follow.
+        if repository.data.show_beta:
+            release_tag = data["newest_release_tag"]
+        else:
+            release_tag = data["last_release_tag"]
+        if not repository.data.releases:
+            return release_tag is not None
+        return release_tag != repository.data.last_version
+
     async def clear_out_removed_repositories(self):
         """Clear out blaclisted repositories."""
         need_to_save = False
@@ -327,21 +405,40 @@ class Hacs(HacsHelpers):
         if need_to_save:
             await self.data.async_write()
 
-    async def async_load_default_repositories(self):
-        """Load known repositories."""
+    async def async_load_default_repositories(self, lists=None):
+        """Load known repositories from the default lists (or only lists)."""
         self.logger.info("Loading known repositories")
 
-        for item in await async_get_list_from_default("removed"):
-            removed = get_removed(item["repository"])
-            removed.reason = item.get("reason")
-            removed.link = item.get("link")
-            removed.removal_type = item.get("removal_type")
-
-        for category in self.common.categories or []:
-            self.queue.add(self.async_get_category_repositories(category))
+        if lists is None or "removed" in lists:
+            load_removed_repositories(await async_get_list_from_default("removed"))
 
+        tasks = [
+            self.async_get_category_repositories(category)
+            for category in self.common.categories or []
+            if lists is None or category in lists
+        ]
+        if self.queue.running:
+            # Reading a list only queues the registrations, the running
+            # execution or the next one picks those up.
+            await asyncio.gather(*tasks)
+            return
+        for task in tasks:
+            self.queue.add(task)
         await self.queue.execute()
 
+    async def async_refresh_default_repositories(self):
+        """Refresh the default lists, and load the ones that changed.
+
+        The repositories are loaded from the stored lists first, so this is
+        usually a single (not modified) request for the tree of hacs/default.
+        """
+        changed = await get_default_lists().async_refresh()
+        if not changed:
+            return
+        await self.async_load_default_repositories(changed)
+        await self.clear_out_removed_repositories()
+        self.hass.bus.async_fire("hacs/repository", {"action": "reload"})
+
     async def async_get_category_repositories(self, category):
         repositories = await async_get_list_from_default(category)
         for repo in repositories:
@@ -0,0 +1,101 @@
+"""Local snapshot of the lists in hacs/default."""
+# pylint: disable=broad-except
+import base64
+import json
+
+from custom_components.hacs.helpers.functions.logger import getLogger
+from custom_components.hacs.helpers.functions.store import (
+    async_load_from_store,
+    async_save_to_store,
+)
+from custom_components.hacs.share import get_github_cache, get_hacs
+
+DEFAULT_REPOSITORY = "hacs/default"
+STORE_KEY = "default_lists"
+
+
+class HacsDefaultLists:
+    """The lists in hacs/default, stored with the blob SHA they were read at.
+
+    The stored lists are served right away, so startup does not wait for
+    GitHub. A refresh is one request for the tree of hacs/default (a 304
+    when nothing was merged there), and only the lists whose blob SHA
+    changed are downloaded again.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        self.logger = getLogger("default_lists")
+        self.lists = {}
+        self.tree_sha = None
+        self.loaded = False
+
+    async def async_load(self):
+        """Load the stored snapshot, once."""
+        if self.loaded:
+            return
+        self.loaded = True
+        stored = await async_load_from_store(get_hacs().hass, STORE_KEY)
+        self.tree_sha = stored.get("tree_sha")
+        self.lists = stored.get("lists", {})
+
+    def get(self, name):
+        """Return the repositories of a stored list, None if it is not stored."""
+        if name not in self.lists:
+            return None
+        return self.lists[name]["repositories"]
+
+    async def _async_get(self, endpoint, store=True):
+        hacs = get_hacs()
+        return await get_github_cache().async_get(
+            hacs.session, hacs.configuration.token, endpoint, store=store
+        )
+
+    async def async_refresh(self, names=()):
+        """Bring the stored lists (and names) up to date, return what changed."""
+        await self.async_load()
+        wanted = set(self.lists) | set(names)
+        try:
+            tree = await self._async_get(f"/repos/{DEFAULT_REPOSITORY}/git/trees/HEAD")
+            tree_sha, treefiles = tree["sha"], tree["tree"]
+        except Exception as exception:
+            # Keep serving the stored lists.
+            self.logger.error(f"Could not refresh the default lists - {exception}")
+            return set()
+        if tree_sha == self.tree_sha and wanted.issubset(self.lists):
+            return set()
+
+        changed = set()
+        for treefile in treefiles:
+            name = treefile["path"]
+            if name not in wanted or treefile["type"] != "blob":
+                continue
+            if self.lists.get(name, {}).get("sha") == treefile["sha"]:
+                continue
+            try:
+                # Blobs never change, and the list is kept in the snapshot.
+                blob = await self._async_get(
+                    f"/repos/{DEFAULT_REPOSITORY}/git/blobs/{treefile['sha']}",
+                    store=False,
+                )
+                repositories = json.loads(base64.b64decode(blob["content"]))
+            except Exception as exception:
+                self.logger.error(f"Could not read the {name} list - {exception}")
+                continue
+            self.lists[name] = {"sha": treefile["sha"], "repositories": repositories}
+            changed.add(name)
+
+        # Lists that could not be read are tried again on the next refresh.
+        if wanted.issubset(self.lists):
+            self.tree_sha = tree_sha
+        try:
+            await async_save_to_store(
+                get_hacs().hass,
+                STORE_KEY,
+                {"tree_sha": self.tree_sha, "lists": self.lists},
+            )
+        except Exception as exception:
+            self.logger.error(f"Could not store the default lists - {exception}")
+        if changed:
+            self.logger.debug(f"Default lists changed: {', '.join(sorted(changed))}")
+        return changed
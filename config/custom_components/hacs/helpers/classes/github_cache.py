@@ -0,0 +1,208 @@
+"""Conditional request cache for the GitHub API."""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from urllib.parse import urlencode
+
+import async_timeout
+import backoff
+from aiogithubapi import (
+    AIOGitHubAPIAuthenticationException,
+    AIOGitHubAPIException,
+    AIOGitHubAPIRatelimitException,
+)
+from aiogithubapi.common.const import ACCEPT_HEADERS, BASE_API_HEADERS, BASE_API_URL
+from aiohttp import ClientError
+
+from custom_components.hacs.helpers.functions.logger import getLogger
+from custom_components.hacs.share import get_hacs
+
+HTTP_STATUS_NOT_MODIFIED = 304
+HTTP_STATUS_RATELIMIT = 403
+# Entries not used for this long are removed, and beyond the entry limit the
+# least recently used are removed; pruning runs at most once per
+# PRUNE_INTERVAL. The limit grows with the number of known repositories, that
+# each have a few cached requests (repository, branch, releases, ...).
+MAX_AGE = 14 * 24 * 60 * 60
+MIN_ENTRIES = 5000
+ENTRIES_PER_REPOSITORY = 10
+PRUNE_INTERVAL = 60 * 60
+
+
+class HacsGitHubCache:
+    """Disk backed cache of GitHub API responses, revalidated with ETags.
+
+    Every cached response is stored in its own file keyed by the request URL,
+    together with the ETag and Last-Modified headers GitHub returned for it.
+    Later requests for the same URL are sent as conditional requests, and a
+    "304 Not Modified" answer (which GitHub does not count against the
+    ratelimit) is served from the stored body. Entries are pruned by age
+    and count, so the directory does not keep growing with every ref HACS
+    has ever looked at.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        self.logger = getLogger("github_cache")
+        self.hits = 0
+        self.misses = 0
+        self._last_prune = 0
+
+    @property
+    def directory(self):
+        """Return the directory the cached responses are stored in."""
+        return f"{get_hacs().system.config_path}/.storage/hacs/github"
+
+    def _path(self, url):
+        """Return the path of the cache file for an URL."""
+        return f"{self.directory}/{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+    def _read(self, url):
+        """Read the cache entry for an URL."""
+        path = self._path(url)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as cachefile:
+                entry = json.load(cachefile)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def _write(self, url, entry):
+        """Write the cache entry for an URL."""
+        path = self._path(url)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as cachefile:
+            json.dump(entry, cachefile)
+        os.replace(f"{path}.tmp", path)
+
+    def _touch(self, url):
+        """Mark the cache entry for an URL as used, pruning goes by last use."""
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def _prune(self, max_entries):
+        """Remove entries not used for MAX_AGE, and the oldest beyond max_entries."""
+        try:
+            filenames = os.listdir(self.directory)
+        except OSError:
+            return
+        now = time.time()
+        entries = []
+        for filename in filenames:
+            path = f"{self.directory}/{filename}"
+            try:
+                modified = os.path.getmtime(path)
+                if now - modified > MAX_AGE or filename.endswith(".tmp"):
+                    os.remove(path)
+                else:
+                    entries.append((modified, path))
+            except OSError:
+                continue
+        entries.sort()
+        for _, path in entries[: max(0, len(entries) - max_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+
+    @staticmethod
+    @backoff.on_exception(
+        backoff.expo, (ClientError, asyncio.TimeoutError), max_tries=5
+    )
+    async def _async_request(session, url, headers):
+        """Return the status, headers and body (None unless 200) of a request."""
+        async with async_timeout.timeout(20):
+            async with session.get(url, headers=headers) as response:
+                body = None
+                if response.status == 200:
+                    body = await response.json()
+                return response.status, response.headers, body
+
+    async def async_get(
+        self,
+        session,
+        token,
+        endpoint,
+        params=None,
+        accept=ACCEPT_HEADERS["base"],
+        store=True,
+    ):
+        """Execute a conditional GET request and return the decoded JSON body.
+
+        With store=False the response is not cached, for callers that keep
+        what they need of it themselves.
+        """
+        hass = get_hacs().hass
+        url = f"{BASE_API_URL}{endpoint}"
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()))}"
+
+        headers = {"Accept": accept, "User-Agent": BASE_API_HEADERS["User-Agent"]}
+        if token is not None:
+            headers["Authorization"] = f"token {token}"
+
+        cached = await hass.async_add_executor_job(self._read, url)
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            status, response_headers, body = await self._async_request(
+                session, url, headers
+            )
+        except (ClientError, asyncio.TimeoutError) as exception:
+            raise AIOGitHubAPIException(
+                f"Could not reach GitHub for {url} - {exception!r}"
+            ) from exception
+        self._update_ratelimits(response_headers)
+
+        if status == HTTP_STATUS_NOT_MODIFIED and cached is not None:
+            self.hits += 1
+            await hass.async_add_executor_job(self._touch, url)
+            return cached["body"]
+
+        if status == HTTP_STATUS_RATELIMIT:
+            raise AIOGitHubAPIRatelimitException("GitHub Ratelimit error")
+        if status != 200:
+            raise AIOGitHubAPIException(f"GitHub returned {status} for {url}")
+
+        if isinstance(body, dict) and body.get("message"):
+            if body["message"] == "Bad credentials":
+                raise AIOGitHubAPIAuthenticationException("Access token is not valid!")
+            raise AIOGitHubAPIException(body["message"])
+
+        self.misses += 1
+        entry = {
+            "url": url,
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+            "body": body,
+        }
+        if store and (entry["etag"] or entry["last_modified"]):
+            try:
+                await hass.async_add_executor_job(self._write, url, entry)
+            except OSError as exception:
+                self.logger.debug(f"Could not cache {url} - {exception}")
+            if time.time() - self._last_prune > PRUNE_INTERVAL:
+                self._last_prune = time.time()
+                repositories = len(get_hacs().repositories or [])
+                await hass.async_add_executor_job(
+                    self._prune,
+                    max(MIN_ENTRIES, ENTRIES_PER_REPOSITORY * repositories),
+                )
+        return body
+
+    @staticmethod
+    def _update_ratelimits(headers):
+        """Keep the shared GitHub client ratelimits in sync."""
+        github = get_hacs().github
+        if github is not None and "X-RateLimit-Remaining" in headers:
+            github.client.ratelimits.load_from_response_headers(headers)
@@ -0,0 +1,98 @@
+"""Repositories with a pending update."""
+from homeassistant.core import callback
+
+from custom_components.hacs.share import get_hacs
+
+
+class HacsPendingUpdates:
+    """The repositories with a pending update, kept up to date on changes.
+
+    RepositoryData calls data_changed when one of the fields pending_update
+    depends on changes. The repository is checked again on the next pass of
+    the event loop, so a burst of changes (like restoring or updating the
+    catalogue) is one check per repository, and listeners are only called
+    when the set, or a version shown for a repository in it, changed.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        self.pending = {}
+        self.repositories = {}
+        self.stale = {}
+        self.listeners = []
+        self._scheduled = False
+
+    def track(self, repository):
+        """Start following the versions of a repository."""
+        self.repositories[id(repository.data)] = repository
+        repository.data.listener = self.data_changed
+        self.data_changed(repository.data)
+
+    def untrack(self, repository):
+        """Stop following a repository."""
+        if self.repositories.get(id(repository.data)) is repository:
+            del self.repositories[id(repository.data)]
+            repository.data.listener = None
+        self.stale.pop(id(repository), None)
+        if self.pending.pop(id(repository), None) is not None:
+            self._schedule()
+
+    def data_changed(self, data):
+        """Check the repository of data again soon."""
+        repository = self.repositories.get(id(data))
+        if repository is not None:
+            self.stale[id(repository)] = repository
+            self._schedule()
+
+    def _schedule(self):
+        hass = get_hacs().hass
+        if self._scheduled or hass is None:
+            return
+        self._scheduled = True
+        hass.loop.call_soon(self.async_process)
+
+    @callback
+    def async_process(self):
+        """Check the stale repositories, and call listeners if anything changed."""
+        self._scheduled = False
+        stale, self.stale = self.stale, {}
+        changed = False
+        for key, repository in stale.items():
+            entry = None
+            if repository.pending_upgrade:
+                entry = {
+                    "name": repository.data.full_name,
+                    "display_name": repository.display_name,
+                    "installed_version": repository.display_installed_version,
+                    "available_version": repository.display_available_version,
+                }
+            if self.pending.get(key, (None, None))[1] == entry:
+                continue
+            changed = True
+            if entry is None:
+                del self.pending[key]
+            else:
+                self.pending[key] = (repository, entry)
+        if changed:
+            for listener in list(self.listeners):
+                listener()
+
+    def async_add_listener(self, listener):
+        """Call listener when the pending updates changed, return the remove."""
+        self.listeners.append(listener)
+
+        def remove_listener():
+            if listener in self.listeners:
+                self.listeners.remove(listener)
+
+        return remove_listener
+
+    def get(self, categories):
+        """Return the repositories with a pending update in categories."""
+        if self.stale:
+            self.async_process()
+        return [
+            entry
+            for repository, entry in self.pending.values()
+            if repository.data.category in categories
+        ]
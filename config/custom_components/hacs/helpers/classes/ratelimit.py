@@ -0,0 +1,111 @@
+"""Token bucket for the GitHub API ratelimit."""
+import asyncio
+import time
+
+from custom_components.hacs.helpers.functions.logger import getLogger
+from custom_components.hacs.share import get_hacs
+
+# Calls kept back for what the user does in the UI (installs, upgrades).
+RESERVED_CALLS = 100
+# Below this many spendable calls, background tasks are spread out evenly
+# over the time left until the ratelimit resets.
+LOW_BUDGET = 500
+# Estimated calls per task until enough tasks have run to measure it.
+DEFAULT_TASK_COST = 10
+MEASURE_AFTER_TASKS = 5
+
+
+class HacsRateLimiter:
+    """Token bucket that spends the GitHub ratelimit on background tasks.
+
+    The bucket is filled from the X-RateLimit-Remaining and X-RateLimit-Reset
+    headers GitHub returns with every response (kept on the shared GitHub
+    client), so it always follows the real budget. The cost of a task is
+    measured from how much the remaining budget drops while tasks run.
+    Tasks start immediately while the budget is healthy, are paced evenly
+    when it runs low, and wait for the reset when nothing is left.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        self.logger = getLogger("ratelimit")
+        self.in_flight = 0
+        self.completed = 0
+        self.spent = 0
+        self.next_start = 0
+        self._last_remaining = None
+        self._last_reset = None
+
+    @property
+    def cost(self):
+        """Return the estimated number of calls a task uses."""
+        if self.completed < MEASURE_AFTER_TASKS:
+            return DEFAULT_TASK_COST
+        return max(1, self.spent / self.completed)
+
+    def _ratelimits(self):
+        """Return (limit, remaining, reset) from the last GitHub response."""
+        github = get_hacs().github
+        if github is None:
+            return None, None, None
+        ratelimits = github.client.ratelimits
+        if ratelimits.remaining is None:
+            return None, None, None
+        return int(ratelimits.limit), int(ratelimits.remaining), int(ratelimits.reset)
+
+    def _sync(self):
+        """Read the ratelimit headers, and add what was used to the spent count."""
+        limit, remaining, reset = self._ratelimits()
+        if remaining is None:
+            return None, None
+        if reset == self._last_reset and remaining < self._last_remaining:
+            self.spent += self._last_remaining - remaining
+        self._last_remaining, self._last_reset = remaining, reset
+        if reset <= time.time():
+            remaining = limit
+        return remaining, reset
+
+    @property
+    def available(self):
+        """Return the calls left for new tasks, or None if that is unknown."""
+        remaining, _ = self._sync()
+        if remaining is None:
+            return None
+        return max(0, remaining - RESERVED_CALLS - int(self.in_flight * self.cost))
+
+    def tasks_available(self):
+        """Return the number of tasks the current budget can pay for."""
+        available = self.available
+        if available is None:
+            return None
+        return int(available // self.cost)
+
+    async def acquire(self):
+        """Wait until the budget allows another task to start."""
+        while True:
+            remaining, reset = self._sync()
+            if remaining is None:
+                break
+            now = time.time()
+            available = remaining - RESERVED_CALLS - self.in_flight * self.cost
+            if available < self.cost:
+                self.logger.debug(
+                    f"Ratelimit budget used, waiting {int(reset - now)}s for the reset"
+                )
+                await asyncio.sleep(max(1, reset - now))
+                continue
+            if available >= LOW_BUDGET:
+                break
+            interval = (reset - now) * self.cost / available
+            start = max(now, self.next_start)
+            self.next_start = start + interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            break
+        self.in_flight += 1
+
+    def release(self):
+        """Mark a task started with acquire as done."""
+        self._sync()
+        self.in_flight -= 1
+        self.completed += 1
@@ -1,12 +1,9 @@
 """Repository."""
 # pylint: disable=broad-except, bad-continuation, no-member
+import asyncio
 import json
-import os
-import tempfile
-import zipfile
 
 from aiogithubapi import AIOGitHubAPIException
-from queueman import QueueManager
 
 from custom_components.hacs.helpers import RepositoryHelpers
 from custom_components.hacs.helpers.classes.exceptions import HacsException
@@ -15,14 +12,23 @@ from custom_components.hacs.helpers.classes.repositorydata import RepositoryData
 from custom_components.hacs.helpers.classes.validate import Validate
 from custom_components.hacs.helpers.functions.is_safe_to_remove import is_safe_to_remove
 
-from custom_components.hacs.helpers.functions.download import async_download_file
+from custom_components.hacs.helpers.functions.download import (
+    async_download_file_to,
+    get_expected_size_and_sha,
+)
+from custom_components.hacs.helpers.functions.filesystem import (
+    async_extract_zip,
+    async_make_temp_directory,
+    async_path_exists,
+    async_remove_paths,
+)
 from custom_components.hacs.helpers.functions.information import (
+    get_contents,
     get_info_md_content,
+    get_last_commit,
     get_repository,
 )
 from custom_components.hacs.helpers.functions.misc import get_repository_name
-from custom_components.hacs.helpers.functions.save import async_save_file
-from custom_components.hacs.helpers.functions.store import async_remove_store
 from custom_components.hacs.helpers.functions.validate_repository import (
     common_update_data,
     common_validate,
@@ -31,6 +37,7 @@ from custom_components.hacs.helpers.functions.version_to_install import (
     version_to_install,
 )
 from custom_components.hacs.share import get_hacs
+from custom_components.hacs.webresponses.category import clear_stat_cache
 
 
 class RepositoryVersions:
@@ -127,6 +134,7 @@ class HacsRepository(RepositoryHelpers):
         self.versions = RepositoryVersions()
         self.pending_restart = False
         self.tree = []
+        self.tree_cache_entry = None
         self.treefiles = []
         self.ref = None
 
@@ -236,8 +244,7 @@ class HacsRepository(RepositoryHelpers):
         self.data.last_updated = self.repository_object.attributes.get("pushed_at", 0)
 
         # Update last available commit
-        await self.repository_object.set_last_commit()
-        self.data.last_commit = self.repository_object.last_commit
+        self.data.last_commit = await get_last_commit(self.repository_object)
 
         # Get the content of hacs.json
         await self.get_repository_manifest_content()
@@ -247,7 +254,6 @@ class HacsRepository(RepositoryHelpers):
 
     async def download_zip_files(self, validate):
         """Download ZIP archive from repository release."""
-        download_queue = QueueManager()
         try:
             contents = False
 
@@ -259,10 +265,12 @@ class HacsRepository(RepositoryHelpers):
             if not contents:
                 return validate
 
-            for content in contents or []:
-                download_queue.add(self.async_download_zip_file(content, validate))
-
-            await download_queue.execute()
+            await asyncio.gather(
+                *[
+                    self.async_download_zip_file(content, validate)
+                    for content in contents
+                ]
+            )
         except BaseException:
             validate.errors.append("Download was not completed")
 
@@ -270,20 +278,28 @@ class HacsRepository(RepositoryHelpers):
 
     async def async_download_zip_file(self, content, validate):
         """Download ZIP archive from repository release."""
+        # Every download gets its own directory, parallel upgrades can have
+        # assets with the same name.
+        directory = None
         try:
-            filecontent = await async_download_file(content.download_url)
+            directory = await async_make_temp_directory()
+            size, sha = get_expected_size_and_sha(content)
+            result = await async_download_file_to(
+                content.download_url,
+                f"{directory}/{self.data.filename}",
+                size,
+                sha,
+            )
 
-            if filecontent is None:
+            if not result:
                 validate.errors.append(f"[{content.name}] was not downloaded")
                 return
 
-            result = await async_save_file(
-                f"{tempfile.gettempdir()}/{self.data.filename}", filecontent
+            await async_extract_zip(
+                f"{directory}/{self.data.filename}",
+                self.content.path.local,
+                remove_archive=True,
             )
-            with zipfile.ZipFile(
-                f"{tempfile.gettempdir()}/{self.data.filename}", "r"
-            ) as zip_file:
-                zip_file.extractall(self.content.path.local)
 
             if result:
                 self.logger.info(f"Download of {content.name} completed")
@@ -291,6 +307,9 @@ class HacsRepository(RepositoryHelpers):
             validate.errors.append(f"[{content.name}] was not downloaded")
         except BaseException:
             validate.errors.append("Download was not completed")
+        finally:
+            if directory is not None:
+                await async_remove_paths(directory)
 
         return validate
 
@@ -315,11 +334,12 @@ class HacsRepository(RepositoryHelpers):
         self.ref = version_to_install(self)
 
         try:
-            manifest = await self.repository_object.get_contents("hacs.json", self.ref)
-            self.repository_manifest = HacsManifest.from_dict(
-                json.loads(manifest.content)
-            )
-            self.data.update_data(json.loads(manifest.content))
+            manifest = await get_contents(self.repository_object, "hacs.json", self.ref)
+            manifest = json.loads(manifest.content)
+            if manifest != self.repository_manifest.manifest:
+                self.data.dirty = True
+            self.repository_manifest = HacsManifest.from_dict(manifest)
+            self.data.update_data(manifest)
         except (AIOGitHubAPIException, Exception) as exception:  # Gotta Catch 'Em All
             if self.hacs.action:
                 raise HacsException(
@@ -334,9 +354,7 @@ class HacsRepository(RepositoryHelpers):
 
         if self.data.id in self.hacs.common.installed:
             self.hacs.common.installed.remove(self.data.id)
-        for repository in self.hacs.repositories:
-            if repository.data.id == self.data.id:
-                self.hacs.repositories.remove(repository)
+        self.hacs.repositories.remove(self)
 
     async def uninstall(self):
         """Run uninstall tasks."""
@@ -359,10 +377,10 @@ class HacsRepository(RepositoryHelpers):
         if self.data.full_name in self.hacs.common.installed:
             self.hacs.common.installed.remove(self.data.full_name)
 
-        await async_remove_store(self.hacs.hass, f"hacs/{self.data.id}.hacs")
-
         self.data.installed_version = None
         self.data.installed_commit = None
+        self.data.installed_files = {}
+        clear_stat_cache()
         self.hacs.hass.bus.async_fire(
             "hacs/repository",
             {"id": 1337, "action": "uninstall", "repository": self.data.full_name},
@@ -370,19 +388,14 @@ class HacsRepository(RepositoryHelpers):
 
     async def remove_local_directory(self):
         """Check the local directory."""
-        import shutil
-        from asyncio import sleep
-
+        remove = []
         try:
             if self.data.category == "python_script":
                 local_path = f"{self.content.path.local}/{self.data.name}.py"
             elif self.data.category == "theme":
-                if os.path.exists(
+                remove.append(
                     f"{self.hacs.system.config_path}/{self.hacs.configuration.theme_path}/{self.data.name}.yaml"
-                ):
-                    os.remove(
-                        f"{self.hacs.system.config_path}/{self.hacs.configuration.theme_path}/{self.data.name}.yaml"
-                    )
+                )
                 local_path = self.content.path.local
             elif self.data.category == "integration":
                 if not self.data.domain:
@@ -392,18 +405,14 @@ class HacsRepository(RepositoryHelpers):
             else:
                 local_path = self.content.path.local
 
-            if os.path.exists(local_path):
+            if await async_path_exists(local_path):
                 if not is_safe_to_remove(local_path):
                     return False
                 self.logger.debug(f"Removing {local_path}")
+                remove.append(local_path)
 
-                if self.data.category in ["python_script"]:
-                    os.remove(local_path)
-                else:
-                    shutil.rmtree(local_path)
-
-                while os.path.exists(local_path):
-                    await sleep(1)
+            # Everything is removed in one executor job, it is done when it returns.
+            await async_remove_paths(*remove)
 
         except BaseException as exception:
             self.logger.debug(f"Removing {local_path} failed with {exception}")
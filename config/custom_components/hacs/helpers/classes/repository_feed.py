@@ -0,0 +1,279 @@
+"""Revision numbered feed of the repositories shown in the frontend."""
+from collections import deque
+
+from homeassistant.core import callback
+
+from custom_components.hacs.helpers.functions.logger import getLogger
+from custom_components.hacs.share import get_hacs
+
+# Bus events after which the repositories can have changed.
+REFRESH_EVENTS = ("hacs/repository", "hacs/status", "hacs/reload")
+# Changes for a burst of events are collected for this many seconds.
+REFRESH_DELAY = 0.5
+# Revisions a client can resume from without a new snapshot.
+HISTORY = 50
+# Fragment fields a query can filter on.
+QUERY_FILTERS = ("category", "installed", "pending_upgrade", "new", "hide")
+
+
+def repository_fragment(repo):
+    """Return what the frontend is sent for a repository."""
+    return {
+        "additional_info": repo.information.additional_info,
+        "authors": repo.data.authors,
+        "available_version": repo.display_available_version,
+        "beta": repo.data.show_beta,
+        "can_install": repo.can_install,
+        "category": repo.data.category,
+        "country": repo.data.country,
+        "config_flow": repo.data.config_flow,
+        "custom": repo.custom,
+        "default_branch": repo.data.default_branch,
+        "description": repo.data.description,
+        "domain": repo.data.domain,
+        "downloads": repo.data.downloads,
+        "file_name": repo.data.file_name,
+        "first_install": repo.status.first_install,
+        "full_name": repo.data.full_name,
+        "hide": repo.data.hide,
+        "hide_default_branch": repo.data.hide_default_branch,
+        "homeassistant": repo.data.homeassistant,
+        "id": repo.data.id,
+        "info": repo.information.info,
+        "installed_version": repo.display_installed_version,
+        "installed": repo.data.installed,
+        "issues": repo.data.open_issues,
+        "javascript_type": repo.information.javascript_type,
+        "last_updated": repo.data.last_updated,
+        "local_path": repo.content.path.local,
+        "main_action": repo.main_action,
+        "name": repo.display_name,
+        "new": repo.data.new,
+        "pending_upgrade": repo.pending_upgrade,
+        "releases": repo.data.published_tags,
+        "selected_tag": repo.data.selected_tag,
+        "stars": repo.data.stargazers_count,
+        "state": repo.state,
+        "status_description": repo.display_status_description,
+        "status": repo.display_status,
+        "topics": repo.data.topics,
+        "updated_info": repo.status.updated_info,
+        "version_or_commit": repo.display_version_or_commit,
+    }
+
+
+def fragment_inputs(repo):
+    """Return what a fragment is built from, besides the shared state.
+
+    The repository data is represented by its revision, the rest are the
+    attributes of a full repository that can change without it.
+    """
+    return (
+        repo.data.revision,
+        repo.display_name,
+        repo.pending_restart,
+        repo.state,
+        repo.content.path.local,
+        repo.information.additional_info,
+        repo.information.info,
+        repo.information.javascript_type,
+        repo.status.first_install,
+        repo.status.updated_info,
+    )
+
+
+class HacsRepositoryFeed:
+    """The repositories for the frontend, and what changed between revisions.
+
+    The fragment of every repository is kept until HACS fires an event
+    that says it may have changed. Events that name a repository only
+    refresh that one. Other events only refresh the repositories whose
+    fragment_inputs changed since their fragment was built, or all of them
+    when the list of default repositories grew. Every refresh that
+    finds a difference bumps the revision, and subscribers get only the
+    changed fields of the changed repositories (None for one that is gone).
+    Changed repositories are also moved in the sorted indexes of the
+    repository registry, which queries page through.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        self.logger = getLogger("repository_feed")
+        self.revision = 0
+        self.fragments = {}
+        self._inputs = {}
+        self._default_count = None
+        self.history = deque(maxlen=HISTORY)
+        self.subscribers = set()
+        self._listeners = None
+        self._pending = set()
+        self._refresh_all = False
+        self._scheduled = None
+
+    def async_start(self):
+        """Build the fragments, and keep them up to date from now on."""
+        if self._listeners is not None:
+            return
+        self.refresh()
+        bus = get_hacs().hass.bus
+        self._listeners = [
+            bus.async_listen(event, self._async_event) for event in REFRESH_EVENTS
+        ]
+
+    def _async_catch_up(self):
+        """Refresh what events scheduled now, instead of after the delay."""
+        if not self._pending and not self._refresh_all:
+            return
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+        self._async_flush()
+
+    def snapshot(self):
+        """Return the fragments of all repositories."""
+        self.async_start()
+        self._async_catch_up()
+        return list(self.fragments.values())
+
+    def query(self, filters, sort="name", descending=False, offset=0, limit=50):
+        """Return the number of matches, and one page of their fragments.
+
+        filters maps names in QUERY_FILTERS to the value a fragment must
+        have, a list of values for category.
+        """
+        self.async_start()
+        self._async_catch_up()
+        hacs = get_hacs()
+        categories = filters.get("category")
+        if isinstance(categories, str):
+            categories = [categories]
+        wanted = [
+            (name, value)
+            for name, value in filters.items()
+            if name in QUERY_FILTERS and name != "category" and value is not None
+        ]
+        total = 0
+        page = []
+        for repository in hacs.repositories.sorted_by(sort, descending):
+            fragment = self.fragments.get(str(repository.data.id))
+            if fragment is None:
+                continue
+            if categories and fragment["category"] not in categories:
+                continue
+            if any(fragment[name] != value for name, value in wanted):
+                continue
+            if offset <= total < offset + limit:
+                page.append(fragment)
+            total += 1
+        return total, page
+
+    def changes_since(self, revision):
+        """Return the changes after a revision, or None if they are not kept."""
+        if revision == self.revision:
+            return {}
+        if (
+            revision > self.revision
+            or not self.history
+            or revision < self.history[0][0] - 1
+        ):
+            return None
+        changes = {}
+        for change_revision, change in self.history:
+            if change_revision <= revision:
+                continue
+            for repository_id, fields in change.items():
+                if fields is None or changes.get(repository_id, {}) is None:
+                    changes[repository_id] = fields
+                else:
+                    changes.setdefault(repository_id, {}).update(fields)
+        return changes
+
+    def refresh(self, full_names=None):
+        """Rebuild fragments, and return the changes by repository id."""
+        hacs = get_hacs()
+        changes = {}
+        current = set()
+        # The custom flag of every repository depends on the default list.
+        check_inputs = full_names is None and self._default_count == len(
+            hacs.common.default
+        )
+        if full_names is None:
+            self._default_count = len(hacs.common.default)
+        for repo in hacs.repositories:
+            if repo.data.category not in hacs.common.categories:
+                continue
+            repository_id = str(repo.data.id)
+            current.add(repository_id)
+            if full_names is not None and repo.data.full_name not in full_names:
+                continue
+            inputs = fragment_inputs(repo)
+            built = self._inputs.get(repository_id)
+            if check_inputs and built and built[0] is repo and built[1] == inputs:
+                continue
+            self._inputs[repository_id] = (repo, inputs)
+            fragment = {
+                key: list(value) if isinstance(value, list) else value
+                for key, value in repository_fragment(repo).items()
+            }
+            previous = self.fragments.get(repository_id)
+            if previous is None:
+                changes[repository_id] = fragment
+            else:
+                changed = {
+                    key: value
+                    for key, value in fragment.items()
+                    if previous.get(key) != value
+                }
+                if changed:
+                    changes[repository_id] = changed
+            if repository_id in changes:
+                hacs.repositories.update_indexes(repo)
+            self.fragments[repository_id] = fragment
+
+        if full_names is None:
+            for repository_id in set(self.fragments) - current:
+                del self.fragments[repository_id]
+                self._inputs.pop(repository_id, None)
+                changes[repository_id] = None
+
+        if changes:
+            self.revision += 1
+            self.history.append((self.revision, changes))
+            for subscriber in list(self.subscribers):
+                subscriber(self.revision, changes)
+        return changes
+
+    def async_subscribe(self, subscriber):
+        """Call subscriber with (revision, changes), return the unsubscribe."""
+        self.async_start()
+        self.subscribers.add(subscriber)
+
+        def unsubscribe():
+            self.subscribers.discard(subscriber)
+
+        return unsubscribe
+
+    @callback
+    def _async_event(self, event):
+        """Schedule a refresh for what an event says may have changed."""
+        full_name = event.data.get("repository")
+        if full_name is None:
+            self._refresh_all = True
+        else:
+            self._pending.add(full_name)
+        if self._scheduled is None:
+            self._scheduled = get_hacs().hass.loop.call_later(
+                REFRESH_DELAY, self._async_flush
+            )
+
+    @callback
+    def _async_flush(self):
+        """Refresh what was scheduled."""
+        full_names = None if self._refresh_all else self._pending
+        self._pending = set()
+        self._refresh_all = False
+        self._scheduled = None
+        changes = self.refresh(full_names)
+        if changes:
+            self.logger.debug(
+                f"Revision {self.revision} changes {len(changes)} repositories"
+            )
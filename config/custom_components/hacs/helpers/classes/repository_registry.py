@@ -0,0 +1,210 @@
+"""Registry of the repositories known to HACS."""
+from bisect import bisect_left, insort
+
+from custom_components.hacs.helpers.classes.pending_updates import HacsPendingUpdates
+from custom_components.hacs.helpers.classes.search_index import HacsSearchIndex
+
+
+def _full_name_key(repository):
+    return (repository.data.full_name or "").lower()
+
+
+# Sort keys the registry keeps an index for, ties are ordered by full_name.
+SORT_KEYS = {
+    "name": lambda repository: (
+        (repository.display_name or "").lower(),
+        _full_name_key(repository),
+    ),
+    "repository_name": lambda repository: (_full_name_key(repository),),
+    "stars": lambda repository: (
+        repository.data.stargazers_count or 0,
+        _full_name_key(repository),
+    ),
+    "last_updated": lambda repository: (
+        str(repository.data.last_updated or ""),
+        _full_name_key(repository),
+    ),
+}
+
+
+class SortedIndex:
+    """Repositories kept in the order of a sort key.
+
+    Entries are (key, id(repository)) tuples in a sorted list, so moving
+    and removing a repository is a bisect instead of a full sort. New
+    repositories are appended and sorted in on the next read, so loading
+    the whole catalogue at startup costs one sort.
+    """
+
+    def __init__(self, key):
+        """Initialize."""
+        self.key = key
+        self.entries = []
+        self.entry = {}
+        self.unsorted = False
+
+    def _discard(self, repository):
+        entry = self.entry.pop(id(repository), None)
+        if entry is None:
+            return
+        if self.unsorted:
+            self.entries.remove(entry)
+            return
+        index = bisect_left(self.entries, entry)
+        if index < len(self.entries) and self.entries[index] == entry:
+            del self.entries[index]
+
+    def update(self, repository):
+        """Add the repository, or move it if its key changed."""
+        entry = (self.key(repository), id(repository))
+        previous = self.entry.get(id(repository))
+        if previous == entry:
+            return
+        if previous is None:
+            self.entries.append(entry)
+            self.unsorted = True
+        else:
+            self._discard(repository)
+            if self.unsorted:
+                self.entries.append(entry)
+            else:
+                insort(self.entries, entry)
+        self.entry[id(repository)] = entry
+
+    def remove(self, repository):
+        """Remove the repository."""
+        self._discard(repository)
+
+    def ids(self, reverse=False):
+        """Return the id() of the repositories in order."""
+        if self.unsorted:
+            self.entries.sort()
+            self.unsorted = False
+        entries = reversed(self.entries) if reverse else self.entries
+        return [entry[1] for entry in entries]
+
+
+class HacsRepositoryRegistry:
+    """Registry of repositories, indexed by ID and lowercased full_name.
+
+    Iterating the registry yields the repositories in registration order,
+    so it can be used everywhere a plain list of repositories was used.
+    Lookups by ID and name are dictionary lookups instead of list scans.
+    Code that changes the ID or full_name of a registered repository must
+    call reindex afterwards, and code that changes what it is sorted by
+    (see SORT_KEYS) or searched by must call update_indexes.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        self._repositories = {}
+        self._keys = {}
+        self._by_id = {}
+        self._by_name = {}
+        self._sorted = {name: SortedIndex(key) for name, key in SORT_KEYS.items()}
+        self.search_index = HacsSearchIndex()
+        self.pending_updates = HacsPendingUpdates()
+
+    def __iter__(self):
+        """Iterate over a snapshot of the registered repositories."""
+        return iter(list(self._repositories.values()))
+
+    def __len__(self):
+        """Return the number of registered repositories."""
+        return len(self._repositories)
+
+    def __contains__(self, repository):
+        """Return True if the repository object is registered."""
+        return id(repository) in self._repositories
+
+    @staticmethod
+    def _index_keys(repository):
+        """Return the ID and name keys for a repository."""
+        repository_id = str(repository.data.id)
+        return (
+            None if repository_id == "0" else repository_id,
+            (repository.data.full_name or "").lower() or None,
+        )
+
+    def _unindex(self, repository):
+        """Remove the index entries of a repository."""
+        id_key, name_key = self._keys.pop(id(repository), (None, None))
+        if id_key is not None and self._by_id.get(id_key) is repository:
+            del self._by_id[id_key]
+        if name_key is not None and self._by_name.get(name_key) is repository:
+            del self._by_name[name_key]
+
+    def _index(self, repository):
+        """Add the index entries of a repository."""
+        id_key, name_key = self._index_keys(repository)
+        self._keys[id(repository)] = (id_key, name_key)
+        if id_key is not None:
+            self._by_id[id_key] = repository
+        if name_key is not None:
+            self._by_name[name_key] = repository
+
+    def add(self, repository):
+        """Register a repository, replacing one with the same ID."""
+        existing = self.get_by_id(repository.data.id)
+        if existing is not None and existing is not repository:
+            self.remove(existing)
+        self._repositories[id(repository)] = repository
+        self._unindex(repository)
+        self._index(repository)
+        self.update_indexes(repository)
+        self.pending_updates.track(repository)
+
+    def remove(self, repository):
+        """Unregister a repository and anything registered with its ID."""
+        existing = self.get_by_id(repository.data.id)
+        for registered in (repository, existing):
+            if registered is not None and id(registered) in self._repositories:
+                self._unindex(registered)
+                for index in self._sorted.values():
+                    index.remove(registered)
+                self.search_index.remove(registered)
+                self.pending_updates.untrack(registered)
+                del self._repositories[id(registered)]
+
+    def reindex(self, repository):
+        """Refresh the index entries after the ID or full_name changed."""
+        if id(repository) not in self._repositories:
+            return
+        self._unindex(repository)
+        self._index(repository)
+        self.update_indexes(repository)
+
+    def update_indexes(self, repository):
+        """Update the sorted and search indexes after the repository changed."""
+        if id(repository) not in self._repositories:
+            return
+        for index in self._sorted.values():
+            index.update(repository)
+        self.search_index.update(repository)
+
+    def sorted_by(self, sort_key, reverse=False):
+        """Return the repositories ordered by one of the SORT_KEYS."""
+        return [
+            self._repositories[repository]
+            for repository in self._sorted[sort_key].ids(reverse)
+        ]
+
+    def search(self, query, limit=20, categories=None):
+        """Return the repositories that best match a search query."""
+        return self.search_index.search(query, limit, categories)
+
+    def get_by_id(self, repository_id):
+        """Return the repository with this ID or None."""
+        if repository_id is None:
+            return None
+        return self._by_id.get(str(repository_id))
+
+    def get_by_name(self, repository_full_name):
+        """Return the repository with this full_name (case insensitive) or None."""
+        if not repository_full_name:
+            return None
+        return self._by_name.get(repository_full_name.lower())
+
+    def is_known(self, repository_id):
+        """Return a bool if the repository ID is registered."""
+        return self.get_by_id(repository_id) is not None
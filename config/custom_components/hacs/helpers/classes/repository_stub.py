@@ -0,0 +1,90 @@
+"""Lightweight stand-in for repositories that are not installed."""
+from custom_components.hacs.helpers.classes.manifest import HacsManifest
+from custom_components.hacs.helpers.classes.repository import (
+    HacsRepository,
+    RepositoryContent,
+    RepositoryInformation,
+    RepositoryPath,
+    RepositoryStatus,
+)
+from custom_components.hacs.helpers.properties import RepositoryHelperProperties
+from custom_components.hacs.share import get_hacs
+
+STUB_CONTENT = RepositoryContent()
+STUB_CONTENT.path = RepositoryPath()
+
+
+class HacsRepositoryStub(RepositoryHelperProperties):
+    """Stored record of a repository that is not installed.
+
+    Restoring thousands of default repositories as full HacsRepository
+    objects is slow and memory hungry, so they are restored as stubs that
+    only carry the RepositoryData and the stored record. The stub has the
+    attributes the repository list reads. Anything that needs to talk to
+    GitHub or touch the filesystem has to call Hacs.hydrate_repository to
+    get the full HacsRepository.
+    """
+
+    stub = True
+    pending_restart = False
+    state = None
+    integration_manifest = {}
+    content = STUB_CONTENT
+
+    display_status = HacsRepository.display_status
+    display_status_description = HacsRepository.display_status_description
+    display_installed_version = HacsRepository.display_installed_version
+    display_available_version = HacsRepository.display_available_version
+    display_version_or_commit = HacsRepository.display_version_or_commit
+    main_action = HacsRepository.main_action
+
+    def __init__(self, data, record):
+        """Initialize."""
+        self.data = data
+        self.record = record
+        self.information = RepositoryInformation()
+        self.status = RepositoryStatus()
+
+    @property
+    def hacs(self):
+        """Return the HACS object."""
+        return get_hacs()
+
+    @property
+    def repository_manifest(self):
+        """Return the stored hacs.json content."""
+        return HacsManifest.from_dict(self.record.get("repository_manifest") or {})
+
+    @property
+    def display_name(self):
+        """Return display name."""
+        name = (self.record.get("repository_manifest") or {}).get("name")
+        if name is not None:
+            return name
+        return (
+            self.data.full_name.split("/")[-1]
+            .replace("-", " ")
+            .replace("_", " ")
+            .title()
+        )
+
+    def hydrate(self):
+        """Create the full repository object, and replace the stub with it."""
+        from custom_components.hacs.repositories import (
+            RERPOSITORY_CLASSES,
+        )  # To handle import error
+
+        repository = RERPOSITORY_CLASSES[self.data.category](self.data.full_name)
+        repository.data = self.data
+        repository.repository_manifest = self.repository_manifest
+        repository.releases.last_release = self.data.last_version
+        repository.releases.last_release_object_downloads = self.record.get(
+            "downloads"
+        )
+        repository.content.path.local = repository.localpath
+        self.hacs.repositories.add(repository)
+        return repository
+
+    def remove(self):
+        """Run remove tasks."""
+        self.hacs.repositories.remove(self)
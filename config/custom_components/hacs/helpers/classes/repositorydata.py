@@ -1,14 +1,54 @@
 """Repository data."""
+import sys
 from datetime import datetime
-from typing import List
+from typing import Callable, Dict, List
 
 import attr
 
+# Values that repeat across the catalogue, only one copy of each is kept.
+INTERNED_STRINGS = frozenset(
+    ("category", "default_branch", "hacs", "homeassistant", "iot_class")
+)
+INTERNED_LISTS = frozenset(("authors", "country", "domains", "topics"))
+# What pending_update is decided by, listener is called when one changes.
+PENDING_UPDATE_FIELDS = frozenset(
+    (
+        "default_branch",
+        "homeassistant",
+        "installed",
+        "installed_commit",
+        "installed_version",
+        "last_commit",
+        "last_version",
+        "releases",
+        "selected_tag",
+    )
+)
 
-@attr.s(auto_attribs=True)
+
+@attr.s(auto_attribs=True, slots=True)
 class RepositoryData:
-    """RepositoryData class."""
+    """RepositoryData class.
+
+    Changes are found in __setattr__, so only assigning a new value marks
+    the data as changed. Lists and dicts must be replaced, not changed in
+    place (data.topics = [*data.topics, topic], not data.topics.append).
+    """
 
+    # Set when any other attribute gets a new value, not exported.
+    # Defined first so it is already set while __init__ fills in the rest.
+    dirty: bool = attr.ib(
+        default=True, eq=False, repr=False, metadata={"exported": False}
+    )
+    # Bumped on every change, never reset, not exported. While the data is
+    # dirty every assignment counts, without comparing the values.
+    revision: int = attr.ib(
+        default=0, eq=False, repr=False, metadata={"exported": False}
+    )
+    # Called with this object when one of PENDING_UPDATE_FIELDS changed.
+    listener: Callable = attr.ib(
+        default=None, eq=False, repr=False, metadata={"exported": False}
+    )
     archived: bool = False
     authors: List[str] = []
     category: str = ""
@@ -25,6 +65,7 @@ class RepositoryData:
     first_install: bool = False
     fork: bool = False
     full_name: str = ""
+    full_name_lower: str = ""
     hacs: str = None  # Minimum HACS version
     hide: bool = False
     hide_default_branch: bool = False
@@ -34,6 +75,7 @@ class RepositoryData:
     installed: bool = False
     installed_commit: str = None
     installed_version: str = None
+    installed_files: Dict[str, str] = attr.ib(factory=dict)  # Local path: git blob SHA
     open_issues: int = 0
     last_commit: str = None
     last_version: str = None
@@ -51,6 +93,27 @@ class RepositoryData:
     topics: List[str] = []
     zip_release: bool = False
 
+    def __setattr__(self, name, value):
+        """Set an attribute, and mark the data as dirty if the value changed."""
+        if name in INTERNED_STRINGS and isinstance(value, str):
+            value = sys.intern(value)
+        elif name in INTERNED_LISTS and value and isinstance(value, list):
+            value = [sys.intern(x) if isinstance(x, str) else x for x in value]
+        if name not in ("dirty", "listener", "revision"):
+            if self.dirty:
+                object.__setattr__(self, "revision", self.revision + 1)
+            elif getattr(self, name) != value:
+                object.__setattr__(self, "dirty", True)
+                object.__setattr__(self, "revision", self.revision + 1)
+        notify = (
+            name in PENDING_UPDATE_FIELDS
+            and self.listener is not None
+            and getattr(self, name) != value
+        )
+        object.__setattr__(self, name, value)
+        if notify:
+            self.listener(self)
+
     @property
     def stars(self):
         """Return the stargazers count."""
@@ -65,15 +128,14 @@ class RepositoryData:
 
     def to_json(self):
         """Export to json."""
-        return self.__dict__
+        return {key: getattr(self, key) for key in EXPORTED_FIELDS}
 
     @staticmethod
     def create_from_dict(source: dict):
         """Set attributes from dicts."""
         data = RepositoryData()
         for key in source:
-            print(key)
-            if key in data.__dict__:
+            if key in EXPORTED_FIELDS:
                 if key == "pushed_at":
                     if source[key] == "":
                         continue
@@ -103,7 +165,7 @@ class RepositoryData:
     def update_data(self, data: dict):
         """Update data of the repository."""
         for key in data:
-            if key in self.__dict__:
+            if key in EXPORTED_FIELDS:
                 if key == "pushed_at":
                     if data[key] == "":
                         continue
@@ -126,3 +188,10 @@ class RepositoryData:
                         setattr(self, key, data[key])
                 else:
                     setattr(self, key, data[key])
+
+
+EXPORTED_FIELDS = tuple(
+    field.name
+    for field in attr.fields(RepositoryData)
+    if field.metadata.get("exported", True)
+)
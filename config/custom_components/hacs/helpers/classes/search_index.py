@@ -0,0 +1,208 @@
+"""Full-text search over the repositories."""
+import heapq
+import re
+from bisect import bisect_left
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+# How much a match in each field counts.
+FIELD_WEIGHTS = {
+    "full_name": 4,
+    "domain": 3,
+    "topics": 2,
+    "authors": 2,
+    "description": 1,
+}
+# How much each kind of match counts.
+EXACT, PREFIX, TYPO = 3, 2, 1
+# Shortest search terms that match as a prefix, and with a typo.
+MIN_PREFIX_LENGTH = 2
+MIN_TYPO_LENGTH = 4
+# Most tokens a single prefix expands to.
+MAX_PREFIX_EXPANSION = 200
+
+
+def tokenize(text):
+    """Return the lowercase words in a text."""
+    return TOKEN.findall(str(text or "").lower())
+
+
+def within_one_edit(left, right):
+    """Return True if the words are at most one edit (or swap) apart."""
+    if len(left) > len(right):
+        left, right = right, left
+    if len(right) - len(left) > 1:
+        return False
+    index = 0
+    while index < len(left) and left[index] == right[index]:
+        index += 1
+    if len(left) != len(right):
+        return left[index:] == right[index + 1 :]
+    if index >= len(left) - 1:
+        return True
+    if left[index + 1 :] == right[index + 1 :]:
+        return True
+    return (
+        left[index] == right[index + 1]
+        and left[index + 1] == right[index]
+        and left[index + 2 :] == right[index + 2 :]
+    )
+
+
+class HacsSearchIndex:
+    """Inverted index over the text fields of the repositories.
+
+    Every token maps to the repositories it appears in, with the weight of
+    the best field it appears in. A search term matches tokens that are
+    equal to it, that start with it, and (for longer terms) that are one
+    typo away from it; all terms have to match. Results are ranked by how
+    well they matched and then by stars. Changed repositories are indexed
+    on the next search, and only tokenized again when one of the indexed
+    fields changed, so loading the catalogue does not pay for searches
+    that may never come.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        self.postings = {}
+        self.documents = {}
+        self.pending = {}
+        self.vocabulary = []
+        self.vocabulary_unsorted = False
+        self.buckets = {}
+
+    @staticmethod
+    def _fields(repository):
+        data = repository.data
+        return (
+            ("full_name", data.full_name),
+            ("domain", data.domain),
+            ("topics", " ".join(data.topics or [])),
+            ("authors", " ".join(data.authors or [])),
+            ("description", data.description),
+        )
+
+    def _tokens(self, fields):
+        """Return the weight of every token in the fields."""
+        tokens = {}
+        for field, text in fields:
+            words = tokenize(text)
+            if field == "full_name" and "/" in (text or ""):
+                # "owner/some-card" is also found as "somecard".
+                words.append("".join(tokenize(text.split("/", 1)[1])))
+            for word in words:
+                if FIELD_WEIGHTS[field] > tokens.get(word, 0):
+                    tokens[word] = FIELD_WEIGHTS[field]
+        return tokens
+
+    def _add_token(self, token):
+        self.postings[token] = {}
+        self.vocabulary.append(token)
+        self.vocabulary_unsorted = True
+        self.buckets.setdefault((token[0], len(token)), set()).add(token)
+
+    def _remove_token(self, token):
+        del self.postings[token]
+        if self.vocabulary_unsorted:
+            self.vocabulary.remove(token)
+        else:
+            del self.vocabulary[bisect_left(self.vocabulary, token)]
+        self.buckets[(token[0], len(token))].discard(token)
+
+    def update(self, repository):
+        """Index a repository, or index it again if its text changed."""
+        self.pending[id(repository)] = repository
+
+    def _index(self, repository):
+        fields = self._fields(repository)
+        document = self.documents.get(id(repository))
+        if document is not None and document[0] == fields:
+            return
+        self._remove(repository)
+        tokens = self._tokens(fields)
+        for token, weight in tokens.items():
+            if token not in self.postings:
+                self._add_token(token)
+            self.postings[token][id(repository)] = weight
+        self.documents[id(repository)] = (fields, tokens, repository)
+
+    def remove(self, repository):
+        """Remove a repository from the index."""
+        self.pending.pop(id(repository), None)
+        self._remove(repository)
+
+    def _remove(self, repository):
+        document = self.documents.pop(id(repository), None)
+        if document is None:
+            return
+        for token in document[1]:
+            postings = self.postings[token]
+            postings.pop(id(repository), None)
+            if not postings:
+                self._remove_token(token)
+
+    def _expand(self, term):
+        """Return the tokens a search term matches, with the match quality."""
+        matches = {}
+        if len(term) >= MIN_PREFIX_LENGTH:
+            if self.vocabulary_unsorted:
+                self.vocabulary.sort()
+                self.vocabulary_unsorted = False
+            index = bisect_left(self.vocabulary, term)
+            for token in self.vocabulary[index : index + MAX_PREFIX_EXPANSION]:
+                if not token.startswith(term):
+                    break
+                matches[token] = PREFIX
+        if len(term) >= MIN_TYPO_LENGTH:
+            for length in (len(term) - 1, len(term), len(term) + 1):
+                for token in self.buckets.get((term[0], length), ()):
+                    if token not in matches and within_one_edit(term, token):
+                        matches[token] = TYPO
+        if term in self.postings:
+            matches[term] = EXACT
+        return matches
+
+    def search(self, query, limit=20, categories=None):
+        """Return the best matching repositories for a query, best first."""
+        pending, self.pending = self.pending, {}
+        for repository in pending.values():
+            self._index(repository)
+
+        scores = None
+        for term in tokenize(query):
+            matches = {}
+            for token, quality in self._expand(term).items():
+                for repository, weight in self.postings[token].items():
+                    score = quality * weight
+                    if score > matches.get(repository, 0):
+                        matches[repository] = score
+            if scores is None:
+                scores = matches
+            else:
+                scores = {
+                    repository: scores[repository] + score
+                    for repository, score in matches.items()
+                    if repository in scores
+                }
+            if not scores:
+                return []
+
+        if scores is None:
+            return []
+        documents = self.documents
+        candidates = (
+            (score, documents[repository][2])
+            for repository, score in scores.items()
+        )
+        if categories is not None:
+            candidates = (
+                (score, repository)
+                for score, repository in candidates
+                if repository.data.category in categories
+            )
+        best = heapq.nlargest(
+            limit,
+            candidates,
+            key=lambda item: (item[0], item[1].data.stargazers_count or 0),
+        )
+        return [repository for _, repository in best]
@@ -0,0 +1,144 @@
+"""Background task queue with priority classes."""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from queueman.exceptions import QueueManagerExecutionStillInProgress
+
+from custom_components.hacs.helpers.functions.logger import getLogger
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_INSTALLED = 1
+PRIORITY_CATALOGUE = 2
+
+# How many tasks of each priority class can run at the same time.
+CONCURRENCY = {
+    PRIORITY_INTERACTIVE: 5,
+    PRIORITY_INSTALLED: 10,
+    PRIORITY_CATALOGUE: 5,
+}
+
+
+class HacsTaskQueue:
+    """Drop-in replacement for queueman.QueueManager with priority classes.
+
+    Tasks are added with a priority, and every time a slot frees up the
+    oldest task of the most important class that has room in its own
+    concurrency budget is started. Tasks added while the queue executes are
+    picked up by that execution, so they can jump ahead of less important
+    work. User actions run in interactive, which takes a slot of the
+    interactive budget; while one runs or waits for a slot, no new
+    background tasks are started.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        self.logger = getLogger("queue")
+        self.running = False
+        self.queues = {priority: [] for priority in CONCURRENCY}
+        self.active = {priority: 0 for priority in CONCURRENCY}
+        self.interactive_actions = 0
+        self._interactive_slots = None
+        self._changed = None
+
+    @property
+    def pending_tasks(self):
+        """Return a count of pending tasks in the queue."""
+        return sum(len(queue) for queue in self.queues.values())
+
+    @property
+    def has_pending_tasks(self):
+        """Return a bool if there are pending tasks in the queue."""
+        return self.pending_tasks != 0
+
+    def clear(self):
+        """Clear the queue."""
+        for queue in self.queues.values():
+            while queue:
+                queue.pop().close()
+
+    def add(self, task, priority=PRIORITY_CATALOGUE):
+        """Add a task to the queue."""
+        self.queues[priority].append(task)
+        self._notify()
+
+    @asynccontextmanager
+    async def interactive(self):
+        """Run a user action in the interactive budget, ahead of background tasks."""
+        if self._interactive_slots is None:
+            self._interactive_slots = asyncio.Semaphore(
+                CONCURRENCY[PRIORITY_INTERACTIVE]
+            )
+        self.interactive_actions += 1
+        try:
+            async with self._interactive_slots:
+                self.active[PRIORITY_INTERACTIVE] += 1
+                try:
+                    yield
+                finally:
+                    self.active[PRIORITY_INTERACTIVE] -= 1
+        finally:
+            self.interactive_actions -= 1
+            self._notify()
+
+    def _notify(self):
+        """Wake up a running execution."""
+        if self._changed is not None:
+            self._changed.set()
+
+    def _next(self):
+        """Return the priority of the next task that can start, or None."""
+        for priority, queue in self.queues.items():
+            if not queue or self.active[priority] >= CONCURRENCY[priority]:
+                continue
+            if priority != PRIORITY_INTERACTIVE and (
+                self.interactive_actions or self.active[PRIORITY_INTERACTIVE]
+            ):
+                return None
+            return priority
+        return None
+
+    async def _run(self, priority, task):
+        """Run a task, and free its slot when it is done."""
+        try:
+            await task
+        finally:
+            self.active[priority] -= 1
+            self._notify()
+
+    async def execute(self, number_of_tasks=None):
+        """Execute tasks from the queue, most important first."""
+        if self.running:
+            self.logger.debug("Execution is already running")
+            raise QueueManagerExecutionStillInProgress
+        if not self.has_pending_tasks:
+            self.logger.debug("The queue is empty")
+            return
+
+        self.running = True
+        self._changed = asyncio.Event()
+        limit = number_of_tasks or self.pending_tasks
+        started = []
+        start = time.time()
+        self.logger.debug(f"Starting queue execution for {limit} tasks")
+        try:
+            while len(started) < limit:
+                self._changed.clear()
+                priority = self._next()
+                if priority is not None:
+                    self.active[priority] += 1
+                    task = self.queues[priority].pop(0)
+                    started.append(asyncio.ensure_future(self._run(priority, task)))
+                    continue
+                if not self.has_pending_tasks:
+                    break
+                await self._changed.wait()
+            await asyncio.gather(*started)
+        finally:
+            self.running = False
+
+        self.logger.debug(
+            f"Queue execution finished for {len(started)} tasks finished in {time.time() - start:.2f} seconds"
+        )
+        if self.has_pending_tasks:
+            self.logger.debug(f"{self.pending_tasks} tasks remaining in the queue")
@@ -0,0 +1,112 @@
+"""Repository trees stored by commit."""
+import hashlib
+import json
+import os
+
+from aiogithubapi.objects.repository.content import AIOGitHubAPIRepositoryTreeContent
+
+from custom_components.hacs.helpers.functions.logger import getLogger
+from custom_components.hacs.share import get_hacs
+
+
+class HacsTreeCache:
+    """Disk cache of repository trees, keyed by repository and commit.
+
+    The tree of a commit never changes, so while the head of a branch (or
+    the tag) HACS checks is the same, the tree is read from here instead
+    of asking GitHub for it. Trees are stored compact, as [path, type,
+    size, sha] rows, next to what was read from the integration manifest
+    at that commit. Only the last commit of every repository is kept.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        self.logger = getLogger("tree_cache")
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def directory(self):
+        """Return the directory the trees are stored in."""
+        return f"{get_hacs().system.config_path}/.storage/hacs/trees"
+
+    def _path(self, full_name):
+        """Return the path of the cache file for a repository."""
+        digest = hashlib.sha1(full_name.lower().encode()).hexdigest()
+        return f"{self.directory}/{digest}.json"
+
+    def _read(self, full_name, key):
+        """Read the entry for a repository, None if it is for another key."""
+        try:
+            with open(self._path(full_name), encoding="utf-8") as cachefile:
+                entry = json.load(cachefile)
+        except (OSError, ValueError):
+            return None
+        if entry.get("full_name") != full_name or entry.get("key") != key:
+            return None
+        return entry
+
+    def _write(self, entry):
+        """Write the entry for a repository."""
+        path = self._path(entry["full_name"])
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as cachefile:
+            json.dump(entry, cachefile, separators=(",", ":"))
+        os.replace(f"{path}.tmp", path)
+
+    async def async_get(self, repository, key):
+        """Return the stored entry for the repository at key, or None."""
+        entry = await get_hacs().hass.async_add_executor_job(
+            self._read, repository.data.full_name, key
+        )
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    async def async_set(self, repository, key, tree):
+        """Store the tree of the repository at key, and return the entry."""
+        entry = {
+            "full_name": repository.data.full_name,
+            "key": key,
+            "tree": [
+                [
+                    treefile.full_path,
+                    treefile.attributes.get("type"),
+                    treefile.attributes.get("size"),
+                    treefile.attributes.get("sha"),
+                ]
+                for treefile in tree
+            ],
+            "manifest_path": None,
+            "integration_manifest": None,
+        }
+        await self._async_write(entry)
+        return entry
+
+    async def async_set_integration_manifest(self, entry, manifest_path, manifest):
+        """Store the integration manifest read at the commit of entry."""
+        entry["manifest_path"] = manifest_path
+        entry["integration_manifest"] = manifest
+        await self._async_write(entry)
+
+    async def _async_write(self, entry):
+        try:
+            await get_hacs().hass.async_add_executor_job(self._write, entry)
+        except OSError as exception:
+            self.logger.debug(
+                f"Could not store the tree of {entry['full_name']} - {exception}"
+            )
+
+    @staticmethod
+    def tree(entry, ref):
+        """Return the tree objects of an entry."""
+        return [
+            AIOGitHubAPIRepositoryTreeContent(
+                {"path": path, "type": kind, "size": size, "sha": sha},
+                entry["full_name"],
+                ref,
+            )
+            for path, kind, size, sha in entry["tree"]
+        ]
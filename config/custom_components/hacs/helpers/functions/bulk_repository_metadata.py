@@ -0,0 +1,99 @@
+"""Helper to fetch metadata for many repositories with one GraphQL query."""
+import json
+from typing import Dict, List
+
+import async_timeout
+
+from custom_components.hacs.helpers.classes.exceptions import HacsException
+from custom_components.hacs.helpers.functions.logger import getLogger
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+BULK_BATCH_SIZE = 50
+
+REPOSITORY_FRAGMENT = """
+  {alias}: repository(owner: {owner}, name: {name}) {{
+    databaseId
+    nameWithOwner
+    description
+    pushedAt
+    isArchived
+    stargazers {{ totalCount }}
+    repositoryTopics(first: 20) {{ nodes {{ topic {{ name }} }} }}
+    latestRelease {{ tagName }}
+    releases(first: 1, orderBy: {{field: CREATED_AT, direction: DESC}}) {{
+      nodes {{ tagName }}
+    }}
+    defaultBranchRef {{ name target {{ oid }} }}
+  }}"""
+
+
+def _build_query(full_names: List[str]) -> str:
+    """Return a GraphQL query with one aliased repository lookup per name."""
+    fragments = []
+    for index, full_name in enumerate(full_names):
+        owner, name = full_name.split("/", 1)
+        fragments.append(
+            REPOSITORY_FRAGMENT.format(
+                alias=f"r{index}", owner=json.dumps(owner), name=json.dumps(name)
+            )
+        )
+    return "query {%s\n}" % "".join(fragments)
+
+
+def _convert(node: dict) -> dict:
+    """Convert a GraphQL repository node to the keys used by RepositoryData."""
+    default_branch = node.get("defaultBranchRef") or {}
+    latest_release = node.get("latestRelease") or {}
+    newest_release = ((node.get("releases") or {}).get("nodes") or [{}])[0]
+    return {
+        "id": node["databaseId"],
+        "full_name": node["nameWithOwner"],
+        "description": node.get("description") or "",
+        "pushed_at": node.get("pushedAt") or "",
+        "archived": node.get("isArchived", False),
+        "stargazers_count": (node.get("stargazers") or {}).get("totalCount", 0),
+        "topics": [
+            topic["topic"]["name"]
+            for topic in (node.get("repositoryTopics") or {}).get("nodes", [])
+        ],
+        "default_branch": default_branch.get("name"),
+        "last_release_tag": latest_release.get("tagName"),
+        "newest_release_tag": newest_release.get("tagName"),
+        "head_sha": ((default_branch.get("target") or {}).get("oid") or "")[0:7],
+    }
+
+
+async def async_get_bulk_repository_metadata(
+    session, token, full_names: List[str]
+) -> Dict[str, dict]:
+    """Return metadata for full_names, keyed by the requested full_name.
+
+    Repositories GitHub could not resolve (deleted, private) are left out of
+    the result.
+    """
+    logger = getLogger("bulk_repository_metadata")
+    headers = {"Authorization": f"bearer {token}"}
+    try:
+        async with async_timeout.timeout(60):
+            response = await session.post(
+                GRAPHQL_URL, json={"query": _build_query(full_names)}, headers=headers
+            )
+            if response.status != 200:
+                raise HacsException(
+                    f"GitHub returned {response.status} for GraphQL query"
+                )
+            result = await response.json()
+    except HacsException:
+        raise
+    except Exception as exception:  # pylint: disable=broad-except
+        raise HacsException(exception)
+
+    for error in result.get("errors") or []:
+        logger.debug(error.get("message"))
+
+    data = result.get("data") or {}
+    return {
+        full_name: _convert(data[f"r{index}"])
+        for index, full_name in enumerate(full_names)
+        if data.get(f"r{index}") is not None
+    }
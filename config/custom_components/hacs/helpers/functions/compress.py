@@ -0,0 +1,108 @@
+"""Precompressed variants of frontend files."""
+import asyncio
+import gzip
+import hashlib
+import io
+import os
+
+from custom_components.hacs.helpers.functions.logger import getLogger
+from custom_components.hacs.share import get_hacs
+
+try:
+    import brotli
+except ImportError:  # Brotli variants are only made when it is installed.
+    brotli = None
+
+COMPRESSIBLE = (".js", ".css")
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+def _gzip_compress(content):
+    """Return content gzipped, with a fixed mtime so output is reproducible."""
+    buffer = io.BytesIO()
+    with gzip.GzipFile(
+        fileobj=buffer, mode="wb", compresslevel=GZIP_LEVEL, mtime=0
+    ) as gzipfile:
+        gzipfile.write(content)
+    return buffer.getvalue()
+
+
+def _brotli_compress(content):
+    """Return content compressed with brotli."""
+    return brotli.compress(content, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+
+
+def get_variants():
+    """Return (suffix, compress, decompress) for the variants to create."""
+    variants = [(".gz", _gzip_compress, gzip.decompress)]
+    if brotli is not None:
+        variants.append((".br", _brotli_compress, brotli.decompress))
+    return variants
+
+
+def _variant_matches(path, decompress, digest):
+    """Return True if the variant at path holds content with this digest."""
+    if not os.path.isfile(path):
+        return False
+    try:
+        with open(path, "rb") as variant:
+            return hashlib.sha256(decompress(variant.read())).digest() == digest
+    except Exception:  # pylint: disable=broad-except
+        return False
+
+
+def compress_file(location):
+    """Write the compressed variants of a file, and return the bytes saved.
+
+    Variants that already hold the same content are left alone, decompressing
+    them is a lot cheaper than compressing again at these levels.
+    """
+    if not location.endswith(COMPRESSIBLE) or not os.path.isfile(location):
+        return 0
+    with open(location, "rb") as source:
+        content = source.read()
+        mtime_ns = os.fstat(source.fileno()).st_mtime_ns
+    digest = hashlib.sha256(content).digest()
+
+    saved = 0
+    for suffix, compress, decompress in get_variants():
+        path = f"{location}{suffix}"
+        if _variant_matches(path, decompress, digest):
+            # The file was written again with the same content, a variant
+            # older than the file is not served, so bring it up to date.
+            if os.stat(path).st_mtime_ns < mtime_ns:
+                os.utime(path, ns=(mtime_ns, mtime_ns))
+        else:
+            with open(f"{path}.tmp", "wb") as variant:
+                variant.write(compress(content))
+            os.replace(f"{path}.tmp", path)
+        saved += len(content) - os.path.getsize(path)
+    return saved
+
+
+async def async_compress_files(locations):
+    """Create compressed variants for locations in the executor pool."""
+    hass = get_hacs().hass
+    logger = getLogger("compress")
+    locations = [
+        location for location in locations if location.endswith(COMPRESSIBLE)
+    ]
+    if not locations:
+        return 0
+
+    results = await asyncio.gather(
+        *[
+            hass.async_add_executor_job(compress_file, location)
+            for location in locations
+        ],
+        return_exceptions=True,
+    )
+    saved = 0
+    for location, result in zip(locations, results):
+        if isinstance(result, Exception):
+            logger.error(f"Could not compress {location} - {result}")
+            continue
+        saved += result
+    logger.debug(f"Compressed {len(locations)} files, saving {saved} bytes")
+    return saved
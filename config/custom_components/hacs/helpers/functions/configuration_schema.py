@@ -18,6 +18,7 @@ COUNTRY = "country"
 DEBUG = "debug"
 RELEASE_LIMIT = "release_limit"
 EXPERIMENTAL = "experimental"
+UPGRADE_CONCURRENCY = "upgrade_concurrency"
 
 # Config group
 PATH_OR_URL = "frontend_repo_path_or_url"
@@ -44,6 +45,7 @@ def hacs_config_option_schema(options: dict = {}) -> dict:
             EXPERIMENTAL: False,
             NETDAEMON: False,
             RELEASE_LIMIT: 5,
+            UPGRADE_CONCURRENCY: 4,
             SIDEPANEL_ICON: "hacs:hacs",
             SIDEPANEL_TITLE: "HACS",
             FRONTEND_REPO: "",
@@ -53,6 +55,9 @@ def hacs_config_option_schema(options: dict = {}) -> dict:
         vol.Optional(SIDEPANEL_TITLE, default=options.get(SIDEPANEL_TITLE)): str,
         vol.Optional(SIDEPANEL_ICON, default=options.get(SIDEPANEL_ICON)): str,
         vol.Optional(RELEASE_LIMIT, default=options.get(RELEASE_LIMIT)): int,
+        vol.Optional(
+            UPGRADE_CONCURRENCY, default=options.get(UPGRADE_CONCURRENCY, 4)
+        ): vol.All(int, vol.Range(min=1, max=10)),
         vol.Optional(COUNTRY, default=options.get(COUNTRY)): vol.In(LOCALE),
         vol.Optional(APPDAEMON, default=options.get(APPDAEMON)): bool,
         vol.Optional(NETDAEMON, default=options.get(NETDAEMON)): bool,
@@ -1,27 +1,47 @@
 """Helpers to download repository content."""
+import asyncio
+import hashlib
 import os
-import pathlib
-import tempfile
-import zipfile
+import tarfile
 
+import aiofiles
 import async_timeout
 import backoff
-from queueman import QueueManager, concurrent
+from queueman import concurrent
 
 from custom_components.hacs.helpers.classes.exceptions import HacsException
+from custom_components.hacs.helpers.functions.compress import async_compress_files
+from custom_components.hacs.helpers.functions.filesystem import (
+    async_extract_zip,
+    async_make_temp_directory,
+    async_makedirs,
+    async_remove_paths,
+    makedirs,
+)
 from custom_components.hacs.helpers.functions.filters import (
     filter_content_return_one_of_type,
 )
 from custom_components.hacs.helpers.functions.logger import getLogger
-from custom_components.hacs.helpers.functions.save import async_save_file
+from custom_components.hacs.helpers.functions.save import process_saved_file
+from custom_components.hacs.operational.backup import BackupFiles
 from custom_components.hacs.share import get_hacs
 
 
+ARCHIVE_URL = "https://codeload.github.com/{full_name}/tar.gz/{ref}"
+# Use the archive when at least this many files are needed, and they make
+# up at least this share of the bytes in the repository.
+ARCHIVE_MIN_FILES = 5
+ARCHIVE_MIN_SHARE = 0.25
+CHUNK_SIZE = 64 * 1024
+
+
 class FileInformation:
-    def __init__(self, url, path, name):
+    def __init__(self, url, path, name, size=None, sha=None):
         self.download_url = url
         self.path = path
         self.name = name
+        self.size = size
+        self.sha = sha
 
 
 @backoff.on_exception(backoff.expo, Exception, max_tries=5)
@@ -53,6 +73,71 @@ async def async_download_file(url):
     return result
 
 
+@backoff.on_exception(backoff.expo, Exception, max_tries=5)
+async def async_download_file_to(url, destination, size=None, sha=None):
+    """Stream a download to destination, and return True when it is in place.
+
+    The content is written in chunks to a temporary file beside destination,
+    which is synced to disk and renamed over destination once the size and
+    the git blob SHA (when they are known) are verified.
+    """
+    hacs = get_hacs()
+    logger = getLogger("async_download_file_to")
+    if url is None:
+        return False
+
+    if "tags/" in url:
+        url = url.replace("tags/", "")
+
+    logger.debug(f"Downloading {url} to {destination}")
+
+    temporary = f"{destination}.download"
+    checksum = None
+    if sha is not None and size is not None:
+        checksum = hashlib.sha1(f"blob {size}\0".encode())
+    received = 0
+
+    try:
+        with async_timeout.timeout(60, loop=hacs.hass.loop):
+            request = await hacs.session.get(url)
+
+            # Make sure that we got a valid result
+            if request.status != 200:
+                raise HacsException(
+                    f"Got status code {request.status} when trying to download {url}"
+                )
+
+            async with aiofiles.open(temporary, mode="wb") as outfile:
+                async for chunk in request.content.iter_chunked(CHUNK_SIZE):
+                    received += len(chunk)
+                    if checksum is not None:
+                        checksum.update(chunk)
+                    await outfile.write(chunk)
+                await outfile.flush()
+                await hacs.hass.async_add_executor_job(os.fsync, outfile.fileno())
+
+        if size is not None and received != size:
+            raise HacsException(
+                f"Got {received} bytes when trying to download {url}, expected {size}"
+            )
+        if checksum is not None and checksum.hexdigest() != sha:
+            raise HacsException(f"Checksum mismatch when trying to download {url}")
+
+        await hacs.hass.async_add_executor_job(os.replace, temporary, destination)
+    except BaseException:
+        await async_remove_paths(temporary)
+        raise
+
+    return True
+
+
+def get_expected_size_and_sha(content):
+    """Return the size and git blob SHA GitHub reported for a file, if known."""
+    if isinstance(content, FileInformation):
+        return content.size, content.sha
+    return content.attributes.get("size"), None
+
+
 def should_try_releases(repository):
     """Return a boolean indicating whether to download releases or not."""
     if (
@@ -87,7 +172,11 @@ def gather_files_to_download(repository):
     if repository.content.single:
         files.extend(
             FileInformation(
-                treefile.download_url, treefile.full_path, treefile.filename
+                treefile.download_url,
+                treefile.full_path,
+                treefile.filename,
+                treefile.attributes.get("size"),
+                treefile.attributes.get("sha"),
             )
             for treefile in tree
             if treefile.filename == repository.data.file_name
@@ -109,7 +198,11 @@ def gather_files_to_download(repository):
                 if not treefile.is_directory:
                     files.append(
                         FileInformation(
-                            treefile.download_url, treefile.full_path, treefile.filename
+                            treefile.download_url,
+                            treefile.full_path,
+                            treefile.filename,
+                            treefile.attributes.get("size"),
+                            treefile.attributes.get("sha"),
                         )
                     )
         if files:
@@ -129,7 +222,13 @@ def gather_files_to_download(repository):
             continue
         if path.full_path.startswith(repository.content.path.remote):
             files.append(
-                FileInformation(path.download_url, path.full_path, path.filename)
+                FileInformation(
+                    path.download_url,
+                    path.full_path,
+                    path.filename,
+                    path.attributes.get("size"),
+                    path.attributes.get("sha"),
+                )
             )
     return files
 
@@ -137,7 +236,6 @@ def gather_files_to_download(repository):
 async def download_zip_files(repository, validate):
     """Download ZIP archive from repository release."""
     contents = []
-    queue = QueueManager()
     try:
         for release in repository.releases.objects:
             repository.logger.info(
@@ -149,10 +247,14 @@ async def download_zip_files(repository, validate):
         if not contents:
             return validate
 
-        for content in contents or []:
-            queue.add(async_download_zip_file(repository, content, validate))
-
-        await queue.execute()
+        # Each install gathers its own downloads, the QueueManager queue is
+        # shared by every instance and would mix up parallel installs.
+        await asyncio.gather(
+            *[
+                async_download_zip_file(repository, content, validate)
+                for content in contents
+            ]
+        )
     except BaseException as exception:
         validate.errors.append(f"Download was not completed [{exception}]")
 
@@ -161,22 +263,28 @@ async def download_zip_files(repository, validate):
 
 async def async_download_zip_file(repository, content, validate):
     """Download ZIP archive from repository release."""
+    # Every download gets its own directory, parallel upgrades can have assets
+    # with the same name.
+    directory = None
     try:
-        filecontent = await async_download_file(content.download_url)
+        directory = await async_make_temp_directory()
+        size, sha = get_expected_size_and_sha(content)
+        result = await async_download_file_to(
+            content.download_url,
+            f"{directory}/{repository.data.filename}",
+            size,
+            sha,
+        )
 
-        if filecontent is None:
+        if not result:
             validate.errors.append(f"[{content.name}] was not downloaded.")
             return
 
-        result = await async_save_file(
-            f"{tempfile.gettempdir()}/{repository.data.filename}", filecontent
+        await async_extract_zip(
+            f"{directory}/{repository.data.filename}",
+            repository.content.path.local,
+            remove_archive=True,
         )
-        with zipfile.ZipFile(
-            f"{tempfile.gettempdir()}/{repository.data.filename}", "r"
-        ) as zip_file:
-            zip_file.extractall(repository.content.path.local)
-
-        os.remove(f"{tempfile.gettempdir()}/{repository.data.filename}")
 
         if result:
             repository.logger.info(f"Download of {content.name} completed")
@@ -184,42 +292,209 @@ async def async_download_zip_file(repository, content, validate):
         validate.errors.append(f"[{content.name}] was not downloaded.")
     except BaseException as exception:
         validate.errors.append(f"Download was not completed [{exception}]")
+    finally:
+        if directory is not None:
+            await async_remove_paths(directory)
 
     return validate
 
 
 async def download_content(repository):
     """Download the content of a directory."""
-    queue = QueueManager()
     contents = gather_files_to_download(repository)
     repository.logger.debug(repository.data.filename)
     if not contents:
         raise HacsException("No content to download")
 
-    for content in contents:
-        if (
+    contents = [
+        content
+        for content in contents
+        if not (
             repository.data.content_in_root
             and repository.data.filename
             and content.name != repository.data.filename
-        ):
-            continue
-        queue.add(dowload_repository_content(repository, content))
-    await queue.execute()
+        )
+    ]
+
+    hass = get_hacs().hass
+    installed_files = get_installed_files(repository, contents)
+    removed = []
+    backup = None
+    delta = installed_files is not None and bool(repository.data.installed_files)
+    if delta:
+        contents, removed = await hass.async_add_executor_job(
+            get_changed_files, repository, contents, installed_files
+        )
+        repository.logger.info(
+            f"Upgrading {len(contents)} changed and removing {len(removed)} old files"
+        )
+
+    written = [get_local_file_path(repository, content) for content in contents]
+    if delta and contents:
+        # Only the changed files are replaced, so only those are backed up.
+        backup = BackupFiles(repository.content.path.local, written)
+        await hass.async_add_executor_job(backup.create)
+
+    if should_download_archive(repository, contents):
+        try:
+            contents = await async_download_archive_content(repository, contents)
+        except BaseException as exception:
+            repository.logger.debug(
+                f"Could not use the archive, downloading files one by one - {exception}"
+            )
+
+    await asyncio.gather(
+        *[dowload_repository_content(repository, content) for content in contents]
+    )
+    await async_compress_files(written)
+
+    if repository.validate.errors:
+        if backup is not None:
+            # The previous files are back, and so is installed_files for them.
+            await hass.async_add_executor_job(backup.restore)
+        else:
+            repository.data.installed_files = {}
+    else:
+        await hass.async_add_executor_job(remove_installed_files, repository, removed)
+        repository.data.installed_files = installed_files or {}
+    if backup is not None:
+        await hass.async_add_executor_job(backup.cleanup)
     return repository.validate
 
 
-@concurrent(10)
-async def dowload_repository_content(repository, content):
-    """Download content."""
-    repository.logger.debug(f"Downloading {content.name}")
+def get_installed_files(repository, contents):
+    """Return the git blob SHA of each file by local path, if all are known.
 
-    filecontent = await async_download_file(content.download_url)
+    Paths are relative to content.path.local. This is stored as
+    RepositoryData.installed_files, so the next upgrade only has to touch
+    files that changed.
+    """
+    installed_files = {}
+    for content in contents:
+        if not isinstance(content, FileInformation) or content.sha is None:
+            return None
+        local_file_path = get_local_file_path(repository, content)
+        installed_files[
+            os.path.relpath(local_file_path, repository.content.path.local)
+        ] = content.sha
+    return installed_files
+
+
+def get_changed_files(repository, contents, installed_files):
+    """Return the contents that need a download, and the files to remove."""
+    previous = repository.data.installed_files
+    changed = []
+    for content in contents:
+        local_file_path = get_local_file_path(repository, content)
+        path = os.path.relpath(local_file_path, repository.content.path.local)
+        if previous.get(path) != content.sha or not os.path.exists(local_file_path):
+            changed.append(content)
+    removed = [path for path in previous if path not in installed_files]
+    return changed, removed
+
+
+def remove_installed_files(repository, removed):
+    """Remove files that are no longer part of the repository."""
+    for path in removed:
+        local_file_path = os.path.join(repository.content.path.local, path)
+        for filename in (
+            local_file_path,
+            f"{local_file_path}.gz",
+            f"{local_file_path}.br",
+        ):
+            if os.path.isfile(filename):
+                repository.logger.debug(f"Removing {filename}")
+                os.remove(filename)
+
+
+def should_download_archive(repository, contents):
+    """Return a bool if one archive of the ref is cheaper than single files."""
+    if len(contents) < ARCHIVE_MIN_FILES:
+        return False
+    if not all(isinstance(content, FileInformation) for content in contents):
+        return False
+    if any(content.size is None for content in contents):
+        return False
+    total = sum(
+        treefile.attributes.get("size") or 0
+        for treefile in repository.tree
+        if not treefile.is_directory
+    )
+    wanted = sum(content.size for content in contents)
+    return total == 0 or wanted / total >= ARCHIVE_MIN_SHARE
 
-    if filecontent is None:
-        repository.validate.errors.append(f"[{content.name}] was not downloaded.")
-        return
 
-    # Save the content of the file.
+async def async_download_archive_content(repository, contents):
+    """Install contents from one tarball of the ref, return what was not in it."""
+    hacs = get_hacs()
+    url = ARCHIVE_URL.format(full_name=repository.data.full_name, ref=repository.ref)
+    targets = {
+        content.path: (
+            get_local_file_path(repository, content),
+            content.size,
+            content.sha,
+        )
+        for content in contents
+    }
+
+    # Its own directory, like the release downloads.
+    directory = await async_make_temp_directory()
+    archive = f"{directory}/{repository.data.full_name.replace('/', '_')}.tar.gz"
+    try:
+        await async_download_file_to(url, archive)
+        extracted = await hacs.hass.async_add_executor_job(
+            extract_archive_content, archive, targets
+        )
+    finally:
+        await async_remove_paths(directory)
+
+    repository.logger.info(
+        f"Extracted {len(extracted)} of {len(targets)} files from the archive"
+    )
+    return [content for content in contents if content.path not in extracted]
+
+
+def extract_archive_content(archive, targets):
+    """Extract the files in targets from a tarball, and return their paths.
+
+    targets maps the path in the repository to the local path, size and git
+    blob SHA of the file. Members are read in one pass in stream mode, and
+    every file is verified before it is renamed into place.
+    """
+    extracted = set()
+    with tarfile.open(archive, "r|gz") as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            # GitHub puts everything in a "{repository}-{sha}" directory.
+            path = member.name.split("/", 1)[-1]
+            if path not in targets or path in extracted:
+                continue
+            local_file_path, size, sha = targets[path]
+            if size is not None and member.size != size:
+                continue
+
+            makedirs(os.path.dirname(local_file_path))
+            checksum = hashlib.sha1(f"blob {member.size}\0".encode())
+            temporary = f"{local_file_path}.download"
+            source = tar.extractfile(member)
+            with open(temporary, "wb") as outfile:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                    checksum.update(chunk)
+                    outfile.write(chunk)
+                outfile.flush()
+                os.fsync(outfile.fileno())
+            if sha is not None and checksum.hexdigest() != sha:
+                os.remove(temporary)
+                continue
+            os.replace(temporary, local_file_path)
+            process_saved_file(local_file_path)
+            extracted.add(path)
+    return extracted
+
+
+def get_local_file_path(repository, content):
+    """Return the local path a downloaded file should be saved to."""
     if repository.content.single or content.path is None:
         local_directory = repository.content.path.local
 
@@ -235,12 +510,31 @@ async def dowload_repository_content(repository, content):
         del local_directory[-1]
         local_directory = "/".join(local_directory)
 
+    return (f"{local_directory}/{content.name}").replace("//", "/")
+
+
+@concurrent(10)
+async def dowload_repository_content(repository, content):
+    """Download content."""
+    repository.logger.debug(f"Downloading {content.name}")
+
     # Check local directory
-    pathlib.Path(local_directory).mkdir(parents=True, exist_ok=True)
+    local_file_path = get_local_file_path(repository, content)
+    await async_makedirs(os.path.dirname(local_file_path))
 
-    local_file_path = (f"{local_directory}/{content.name}").replace("//", "/")
+    size, sha = get_expected_size_and_sha(content)
+    try:
+        result = await async_download_file_to(
+            content.download_url, local_file_path, size, sha
+        )
+        if result:
+            await get_hacs().hass.async_add_executor_job(
+                process_saved_file, local_file_path
+            )
+    except BaseException as exception:
+        repository.logger.error(f"Could not download {content.name} - {exception}")
+        result = False
 
-    result = await async_save_file(local_file_path, filecontent)
     if result:
         repository.logger.info(f"Download of {content.name} completed")
         return
@@ -0,0 +1,157 @@
+"""Filesystem helpers that keep blocking I/O off the event loop."""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import traceback
+import zipfile
+
+from custom_components.hacs.helpers.functions.logger import getLogger
+from custom_components.hacs.share import get_hacs
+
+
+def warn_if_on_event_loop(operation, path, frame=None):
+    """Log a warning with the caller when blocking I/O runs on the event loop.
+
+    Only active when HACS runs with debug enabled. frame is the caller, by
+    default the one of the helper calling this.
+    """
+    configuration = get_hacs().configuration
+    if configuration is None or not configuration.debug:
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    if frame is None:
+        caller = "".join(traceback.format_stack(limit=4)[:-2]).strip()
+    else:
+        caller = "".join(traceback.format_stack(frame, limit=2)).strip()
+    getLogger("filesystem").warning(
+        f"Blocking {operation} of {path} on the event loop\n{caller}"
+    )
+
+
+# Audit events of blocking filesystem calls, see enable_blocking_io_warnings.
+AUDITED_EVENTS = {
+    "open",
+    "os.listdir",
+    "os.mkdir",
+    "os.remove",
+    "os.rename",
+    "os.rmdir",
+    "os.scandir",
+    "shutil.copyfile",
+    "shutil.rmtree",
+}
+HACS_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+_AUDIT = threading.local()
+_AUDIT_HOOK_ADDED = False
+
+
+def _audit_hook(event, args):
+    """Warn about a blocking filesystem call made by HACS code on the loop."""
+    if event not in AUDITED_EVENTS or getattr(_AUDIT, "active", False):
+        return
+    path = args[0] if args else None
+    if isinstance(path, str) and path.endswith((".py", ".pyc")):
+        # Imports.
+        return
+    _AUDIT.active = True
+    try:
+        frame = sys._getframe(1)  # pylint: disable=protected-access
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename == __file__:
+                # The helpers here warn for themselves.
+                return
+            if filename.startswith(HACS_DIRECTORY):
+                warn_if_on_event_loop(event, path, frame)
+                return
+            frame = frame.f_back
+    finally:
+        _AUDIT.active = False
+
+
+def enable_blocking_io_warnings():
+    """Also warn when HACS code calls open, os or shutil directly on the loop.
+
+    The helpers in this module always check for themselves. Direct calls are
+    found through an audit hook (Python 3.8 and later), which can not be
+    removed again, so it is only added when HACS runs with debug enabled and
+    stays silent when debug is turned off. os.stat and os.path checks are
+    not audited by Python, and are only found when they go through the
+    helpers here.
+    """
+    global _AUDIT_HOOK_ADDED  # pylint: disable=global-statement
+    if _AUDIT_HOOK_ADDED or not hasattr(sys, "addaudithook"):
+        return
+    sys.addaudithook(_audit_hook)
+    _AUDIT_HOOK_ADDED = True
+
+
+def path_exists(path):
+    """Return a bool if the path exists."""
+    warn_if_on_event_loop("exists", path)
+    return os.path.exists(path)
+
+
+def makedirs(path):
+    """Create a directory and its parents."""
+    warn_if_on_event_loop("makedirs", path)
+    os.makedirs(path, exist_ok=True)
+
+
+def remove_path(path):
+    """Remove a file or a directory tree if it exists."""
+    warn_if_on_event_loop("remove", path)
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
+def remove_paths(paths):
+    """Remove files and directory trees in one go."""
+    for path in paths:
+        remove_path(path)
+
+
+def extract_zip(archive, destination, remove_archive=False):
+    """Extract a zip archive, and optionally remove the archive after."""
+    warn_if_on_event_loop("extract", archive)
+    with zipfile.ZipFile(archive, "r") as zip_file:
+        zip_file.extractall(destination)
+    if remove_archive:
+        os.remove(archive)
+
+
+async def async_path_exists(path):
+    """Return a bool if the path exists."""
+    return await get_hacs().hass.async_add_executor_job(path_exists, path)
+
+
+async def async_makedirs(path):
+    """Create a directory and its parents."""
+    await get_hacs().hass.async_add_executor_job(makedirs, path)
+
+
+async def async_remove_paths(*paths):
+    """Remove files and directory trees, and return when they are gone."""
+    await get_hacs().hass.async_add_executor_job(remove_paths, paths)
+
+
+async def async_make_temp_directory():
+    """Create a new temporary directory, and return its path."""
+    return await get_hacs().hass.async_add_executor_job(
+        tempfile.mkdtemp, None, "hacs_"
+    )
+
+
+async def async_extract_zip(archive, destination, remove_archive=False):
+    """Extract a zip archive in the executor."""
+    await get_hacs().hass.async_add_executor_job(
+        extract_zip, archive, destination, remove_archive
+    )
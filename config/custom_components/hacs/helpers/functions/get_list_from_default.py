@@ -1,33 +1,20 @@
 """Helper to get default repositories."""
-import json
 from typing import List
 
-from aiogithubapi import AIOGitHubAPIException
-
-from custom_components.hacs.helpers.classes.exceptions import HacsException
-from custom_components.hacs.helpers.functions.information import get_repository
 from custom_components.hacs.helpers.functions.logger import getLogger
-from custom_components.hacs.share import get_hacs
+from custom_components.hacs.share import get_default_lists
 
 
 async def async_get_list_from_default(default: str) -> List:
-    """Get repositories from default list."""
-    hacs = get_hacs()
-    repositories = []
+    """Get repositories from the stored default list, read it if it is not stored."""
+    default_lists = get_default_lists()
     logger = getLogger("async_get_list_from_default")
 
-    try:
-        repo = await get_repository(
-            hacs.session, hacs.configuration.token, "hacs/default",
-        )
-        content = await repo.get_contents(default, repo.default_branch)
-        repositories = json.loads(content.content)
-
-    except (AIOGitHubAPIException, HacsException) as exception:
-        logger.error(exception)
-
-    except BaseException as exception:
-        logger.error(exception)
+    await default_lists.async_load()
+    repositories = default_lists.get(default)
+    if repositories is None:
+        await default_lists.async_refresh([default])
+        repositories = default_lists.get(default) or []
 
     logger.debug(f"Got {len(repositories)} elements for {default}")
 
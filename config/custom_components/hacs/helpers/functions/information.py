@@ -2,10 +2,17 @@
 import json
 
 from aiogithubapi import AIOGitHubAPIException, GitHub
+from aiogithubapi.common.const import ACCEPT_HEADERS
+from aiogithubapi.objects.repository import AIOGitHubAPIRepository
+from aiogithubapi.objects.repository.content import (
+    AIOGitHubAPIRepositoryContent,
+    AIOGitHubAPIRepositoryTreeContent,
+)
+from aiogithubapi.objects.repository.release import AIOGitHubAPIRepositoryRelease
 
 from custom_components.hacs.helpers.classes.exceptions import HacsException
 from custom_components.hacs.helpers.functions.template import render_template
-from custom_components.hacs.share import get_hacs
+from custom_components.hacs.share import get_github_cache, get_hacs, get_tree_cache
 
 
 def info_file(repository):
@@ -41,7 +48,7 @@ async def get_info_md_content(repository):
     if not filename:
         return ""
     try:
-        info = await repository.repository_object.get_contents(filename, repository.ref)
+        info = await get_contents(repository.repository_object, filename, repository.ref)
         if info is None:
             return ""
         info = info.content.replace("<svg", "<disabled").replace("</svg", "</disabled")
@@ -56,25 +63,118 @@ async def get_repository(session, token, repository_full_name):
     """Return a repository object or None."""
     try:
         github = GitHub(token, session)
-        return await github.get_repo(repository_full_name)
+        response = await get_github_cache().async_get(
+            session,
+            token,
+            f"/repos/{repository_full_name}",
+            accept=ACCEPT_HEADERS["preview"],
+        )
+        return AIOGitHubAPIRepository(github.client, response)
     except (AIOGitHubAPIException, Exception) as exception:
         raise HacsException(exception)
 
 
-async def get_tree(repository, ref):
+async def get_tree(repository, ref, store=True):
     """Return the repository tree."""
+    if ref is None:
+        raise HacsException("Missing ref")
     try:
-        return await repository.get_tree(ref)
+        response = await get_github_cache().async_get(
+            repository.client.session,
+            repository.client.token,
+            f"/repos/{repository.full_name}/git/trees/{ref}",
+            {"recursive": "1"},
+            store=store,
+        )
+        return [
+            AIOGitHubAPIRepositoryTreeContent(x, repository.full_name, ref)
+            for x in response.get("tree", [])
+        ]
     except AIOGitHubAPIException as exception:
         raise HacsException(exception)
 
 
+async def get_cached_tree(repository):
+    """Return the tree at repository.ref, from the tree cache if the commit is known.
+
+    Tags are taken to never move, for branches the head commit is checked.
+    The entry that was used or stored is kept as repository.tree_cache_entry.
+    """
+    hacs = get_hacs()
+    ref = repository.ref
+    repository.tree_cache_entry = None
+    if hacs.action:
+        return await get_tree(repository.repository_object, ref)
+
+    if ref in (repository.data.published_tags or []):
+        commit = ref
+    else:
+        try:
+            commit = await get_head_commit(repository.repository_object, ref)
+        except (AIOGitHubAPIException, KeyError, TypeError):
+            return await get_tree(repository.repository_object, ref)
+
+    cache = get_tree_cache()
+    key = [ref, commit]
+    entry = await cache.async_get(repository, key)
+    if entry is not None:
+        repository.tree_cache_entry = entry
+        return cache.tree(entry, ref)
+
+    # The tree cache keeps this tree, so the response is not cached as well.
+    tree = await get_tree(repository.repository_object, ref, store=False)
+    if tree:
+        repository.tree_cache_entry = await cache.async_set(repository, key, tree)
+    return tree
+
+
 async def get_releases(repository, prerelease=False, returnlimit=5):
     """Return the repository releases."""
     try:
-        return await repository.get_releases(prerelease, returnlimit)
+        response = await get_github_cache().async_get(
+            repository.client.session,
+            repository.client.token,
+            f"/repos/{repository.full_name}/releases",
+        )
     except AIOGitHubAPIException as exception:
         raise HacsException(exception)
+    releases = [
+        AIOGitHubAPIRepositoryRelease(release)
+        for release in response or []
+        if prerelease or not release.get("prerelease", False)
+    ]
+    return releases[:returnlimit]
+
+
+async def get_contents(repository, path, ref=None):
+    """Return the content object(s) for a path in the repository."""
+    params = {"path": path}
+    if ref is not None:
+        params["ref"] = ref.replace("tags/", "")
+    response = await get_github_cache().async_get(
+        repository.client.session,
+        repository.client.token,
+        f"/repos/{repository.full_name}/contents/{path}",
+        params,
+    )
+    if isinstance(response, list):
+        return [AIOGitHubAPIRepositoryContent(x) for x in response]
+    return AIOGitHubAPIRepositoryContent(response)
+
+
+async def get_head_commit(repository, branch):
+    """Return the SHA of the last commit on a branch."""
+    response = await get_github_cache().async_get(
+        repository.client.session,
+        repository.client.token,
+        f"/repos/{repository.full_name}/branches/{branch}",
+    )
+    return response["commit"]["sha"]
+
+
+async def get_last_commit(repository):
+    """Return the short SHA of the last commit on the default branch."""
+    return (await get_head_commit(repository, repository.default_branch))[0:7]
 
 
 def get_frontend_version():
@@ -109,13 +209,25 @@ async def get_integration_manifest(repository):
         manifest_path = f"{repository.content.path.remote}/manifest.json"
     if manifest_path not in [x.full_path for x in repository.tree]:
         raise HacsException(f"No file found '{manifest_path}'")
-    try:
-        manifest = await repository.repository_object.get_contents(
-            manifest_path, repository.ref
-        )
-        manifest = json.loads(manifest.content)
-    except BaseException as exception:
-        raise HacsException(f"Could not read manifest.json [{exception}]")
+    entry = getattr(repository, "tree_cache_entry", None)
+    if (
+        entry is not None
+        and entry["manifest_path"] == manifest_path
+        and entry["integration_manifest"] is not None
+    ):
+        manifest = entry["integration_manifest"]
+    else:
+        try:
+            manifest = await get_contents(
+                repository.repository_object, manifest_path, repository.ref
+            )
+            manifest = json.loads(manifest.content)
+        except BaseException as exception:
+            raise HacsException(f"Could not read manifest.json [{exception}]")
+        if entry is not None:
+            await get_tree_cache().async_set_integration_manifest(
+                entry, manifest_path, manifest
+            )
 
     try:
         repository.integration_manifest = manifest
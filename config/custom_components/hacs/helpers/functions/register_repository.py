@@ -43,15 +43,8 @@ async def register_repository(full_name, category, check=True, ref=None):
             hacs.common.skip.append(repository.data.full_name)
             raise HacsException(f"Validation for {full_name} failed with {exception}.")
 
-    exists = (
-        False
-        if str(repository.data.id) == "0"
-        else [x for x in hacs.repositories if str(x.data.id) == str(repository.data.id)]
-    )
-
-    if exists:
-        if exists[0] in hacs.repositories:
-            hacs.repositories.remove(exists[0])
+    if hacs.repositories.is_known(repository.data.id):
+        hacs.repositories.remove(hacs.repositories.get_by_id(repository.data.id))
 
     elif hacs.hass is not None and (
             (check and repository.data.new) or hacs.system.status.new
@@ -65,4 +58,4 @@ async def register_repository(full_name, category, check=True, ref=None):
                 "repository_id": repository.data.id,
             },
         )
-    hacs.repositories.append(repository)
+    hacs.repositories.add(repository)
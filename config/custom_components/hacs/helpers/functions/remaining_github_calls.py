@@ -1,7 +1,6 @@
 """Helper to calculate the remaining calls to github."""
-import math
-
 from custom_components.hacs.helpers.functions.logger import getLogger
+from custom_components.hacs.share import get_ratelimiter
 
 
 async def remaining(github):
@@ -19,15 +18,6 @@ async def remaining(github):
 
 async def get_fetch_updates_for(github):
     """Helper to calculate the number of repositories we can fetch data for."""
-    limit = await remaining(github)
-    if limit is None:
+    if await remaining(github) is None:
         return None
-
-    margin = 100
-    pr_repo = 10
-
-    return (
-        0
-        if limit - margin <= pr_repo
-        else math.floor((limit - margin) / pr_repo)
-    )
+    return get_ratelimiter().tasks_available() or 0
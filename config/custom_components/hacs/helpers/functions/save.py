@@ -1,11 +1,11 @@
 """Download."""
-import gzip
 import os
-import shutil
 
 import aiofiles
 
+from custom_components.hacs.helpers.functions.compress import compress_file
 from custom_components.hacs.helpers.functions.logger import getLogger
+from custom_components.hacs.share import get_hacs
 
 
 async def async_save_file(location, content):
@@ -28,26 +28,37 @@ async def async_save_file(location, content):
             await outfile.write(content)
             outfile.close()
 
-        # Create gz for .js files
-        if os.path.isfile(location) and (
-            location.endswith(".js") or location.endswith(".css")
-        ):
-            with open(location, "rb") as f_in:
-                with gzip.open(f"{location}.gz", "wb") as f_out:
-                    shutil.copyfileobj(f_in, f_out)
-
-        # Remove with 2.0
-        if "themes" in location and location.endswith(".yaml"):
-            filename = location.split("/")[-1]
-            base = location.split("/themes/")[0]
-            combined = f"{base}/themes/{filename}"
-            if os.path.exists(combined):
-                logger.info(f"Removing old theme file {combined}")
-                os.remove(combined)
+        return await get_hacs().hass.async_add_executor_job(
+            finish_saved_file, location
+        )
 
     except BaseException as error:
         msg = f"Could not write data to {location} - {error}"
         logger.error(msg)
         return False
 
+
+def finish_saved_file(location):
+    """Process and compress a saved file, and return a bool if it exists."""
+    process_saved_file(location)
+    try:
+        compress_file(location)
+    except Exception as exception:  # pylint: disable=broad-except
+        getLogger("download.save").error(
+            f"Could not compress {location} - {exception}"
+        )
     return os.path.exists(location)
+
+
+def process_saved_file(location):
+    """Run the tasks for a file that was just written to location."""
+    logger = getLogger("download.save")
+
+    # Remove with 2.0
+    if "themes" in location and location.endswith(".yaml"):
+        filename = location.split("/")[-1]
+        base = location.split("/themes/")[0]
+        combined = f"{base}/themes/{filename}"
+        if os.path.exists(combined):
+            logger.info(f"Removing old theme file {combined}")
+            os.remove(combined)
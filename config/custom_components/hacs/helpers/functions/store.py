@@ -4,31 +4,38 @@ from homeassistant.helpers.json import JSONEncoder
 
 from custom_components.hacs.const import VERSION_STORAGE
 
+STORES = {}
 
-async def async_load_from_store(hass, key):
-    """Load the retained data from store and return de-serialized data."""
+
+def get_store_for_key(hass, key):
+    """Return the (shared) Store object for a key."""
     from homeassistant.helpers.storage import Store
 
     key = key if "/" in key else f"hacs.{key}"
-    store = Store(hass, VERSION_STORAGE, key, encoder=JSONEncoder)
-    restored = await store.async_load()
+    if key not in STORES or STORES[key].hass is not hass:
+        STORES[key] = Store(hass, VERSION_STORAGE, key, encoder=JSONEncoder)
+    return STORES[key]
+
+
+async def async_load_from_store(hass, key):
+    """Load the retained data from store and return de-serialized data."""
+    restored = await get_store_for_key(hass, key).async_load()
     return {} if restored is None else restored
 
 
 async def async_save_to_store(hass, key, data):
     """Generate dynamic data to store and save it to the filesystem."""
-    from homeassistant.helpers.storage import Store
+    await get_store_for_key(hass, key).async_save(data)
 
-    key = key if "/" in key else f"hacs.{key}"
-    store = Store(hass, VERSION_STORAGE, key, encoder=JSONEncoder)
-    await store.async_save(data)
+
+def async_delay_save_to_store(hass, key, data_func, delay):
+    """Schedule a save, collapsing saves for the same key within the delay."""
+    get_store_for_key(hass, key).async_delay_save(data_func, delay)
 
 
 async def async_remove_store(hass, key):
     """Remove a store element that should no longer be used"""
-    from homeassistant.helpers.storage import Store
-
     if "/" not in key:
         return
-    store = Store(hass, VERSION_STORAGE, key, encoder=JSONEncoder)
-    await store.async_remove()
+    await get_store_for_key(hass, key).async_remove()
+    STORES.pop(key, None)
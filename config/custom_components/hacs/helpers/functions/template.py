@@ -1,11 +1,52 @@
 """Custom template support."""
 # pylint: disable=broad-except
-from jinja2 import Template
+import hashlib
+from collections import OrderedDict
+
+from jinja2.sandbox import SandboxedEnvironment
 
 from custom_components.hacs.helpers.functions.logger import getLogger
 
 logger = getLogger("template")
 
+# Templates come from any repository, so they are rendered in a sandbox.
+ENVIRONMENT = SandboxedEnvironment()
+TEMPLATE_CACHE_SIZE = 256
+RENDER_CACHE_SIZE = 2048
+
+TEMPLATE_CACHE = OrderedDict()
+RENDER_CACHE = OrderedDict()
+
+
+def _cache_get(cache, key):
+    """Return a cached value and mark it as recently used, or raise KeyError."""
+    value = cache[key]
+    cache.move_to_end(key)
+    return value
+
+
+def _cache_set(cache, key, value, size):
+    """Cache a value, and drop the least recently used beyond size."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > size:
+        cache.popitem(last=False)
+
+
+def get_template(digest, content):
+    """Return the compiled template for content, None if it does not compile."""
+    try:
+        return _cache_get(TEMPLATE_CACHE, digest)
+    except KeyError:
+        pass
+    try:
+        template = ENVIRONMENT.from_string(content)
+    except BaseException as exception:
+        logger.debug(exception)
+        template = None
+    _cache_set(TEMPLATE_CACHE, digest, template, TEMPLATE_CACHE_SIZE)
+    return template
+
 
 def render_template(content, context):
     """Render templates in content."""
@@ -15,18 +56,32 @@ def render_template(content, context):
     else:
         prerelease = False
 
+    variables = {
+        "installed": context.data.installed,
+        "pending_update": context.pending_upgrade,
+        "prerelease": prerelease,
+        "selected_tag": context.data.selected_tag,
+        "version_available": context.releases.last_release,
+        "version_installed": context.display_installed_version,
+    }
+    digest = hashlib.sha1(content.encode("utf-8")).digest()
+    key = (digest, *variables.values())
+    try:
+        return _cache_get(RENDER_CACHE, key)
+    except (KeyError, TypeError):
+        pass
+
     # Render the template
+    template = get_template(digest, content)
+    if template is None:
+        return content
     try:
-        render = Template(content)
-        render = render.render(
-            installed=context.data.installed,
-            pending_update=context.pending_upgrade,
-            prerelease=prerelease,
-            selected_tag=context.data.selected_tag,
-            version_available=context.releases.last_release,
-            version_installed=context.display_installed_version,
-        )
-        return render
+        render = template.render(**variables)
     except BaseException as exception:
         logger.debug(exception)
         return content
+    try:
+        _cache_set(RENDER_CACHE, key, render, RENDER_CACHE_SIZE)
+    except TypeError:
+        pass  # A variable that can not be hashed, render it every time.
+    return render
@@ -0,0 +1,57 @@
+"""Upgrade repositories in parallel."""
+import asyncio
+
+from custom_components.hacs.helpers.functions.logger import getLogger
+from custom_components.hacs.share import get_hacs
+
+DEFAULT_CONCURRENCY = 4
+
+
+async def async_upgrade_repositories(repositories, concurrency=None):
+    """Install the latest version of repositories, and return those that failed.
+
+    Up to concurrency installs run at the same time, and a failing install
+    does not stop the others. Progress is fired as "hacs/upgrade_all"
+    events with the number of repositories done, failed and in total.
+    """
+    hacs = get_hacs()
+    logger = getLogger("upgrade_all")
+    if not concurrency:
+        concurrency = hacs.configuration.upgrade_concurrency or DEFAULT_CONCURRENCY
+    concurrency = max(1, concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    failed = []
+    done = 0
+
+    def fire_progress():
+        hacs.hass.bus.async_fire(
+            "hacs/upgrade_all",
+            {
+                "total": len(repositories),
+                "done": done,
+                "failed": [repository.data.full_name for repository in failed],
+            },
+        )
+
+    async def upgrade(repository):
+        nonlocal done
+        async with semaphore:
+            repository.data.selected_tag = None
+            try:
+                await repository.async_install()
+                if not repository.validate.success:
+                    failed.append(repository)
+            except Exception as exception:  # pylint: disable=broad-except
+                logger.error(
+                    f"Upgrade of {repository.data.full_name} failed - {exception}"
+                )
+                failed.append(repository)
+            done += 1
+            fire_progress()
+
+    logger.info(f"Upgrading {len(repositories)} repositories, {concurrency} at a time")
+    fire_progress()
+    async with hacs.queue.interactive():
+        await asyncio.gather(*[upgrade(repository) for repository in repositories])
+    logger.info(f"Upgraded {done - len(failed)} of {len(repositories)} repositories")
+    return failed
@@ -3,9 +3,9 @@ from aiogithubapi import AIOGitHubAPIException
 
 from custom_components.hacs.helpers.classes.exceptions import HacsException
 from custom_components.hacs.helpers.functions.information import (
+    get_cached_tree,
     get_releases,
     get_repository,
-    get_tree,
 )
 from custom_components.hacs.helpers.functions.version_to_install import (
     version_to_install,
@@ -35,6 +35,7 @@ async def common_update_data(repository, ignore_issues=False):
         )
         repository.repository_object = repository_object
         repository.data.update_data(repository_object.attributes)
+        hacs.repositories.reindex(repository)
     except (AIOGitHubAPIException, HacsException) as exception:
         if not hacs.system.status.startup:
             repository.logger.error(exception)
@@ -83,7 +84,7 @@ async def common_update_data(repository, ignore_issues=False):
     )
 
     try:
-        repository.tree = await get_tree(repository.repository_object, repository.ref)
+        repository.tree = await get_cached_tree(repository)
         if not repository.tree:
             raise HacsException("No files in tree")
         repository.treefiles = []
@@ -1,14 +1,15 @@
 # pylint: disable=missing-class-docstring,missing-module-docstring,missing-function-docstring,no-member
-import os
 import tempfile
 from abc import ABC
 
 from custom_components.hacs.helpers.classes.exceptions import HacsException
 from custom_components.hacs.helpers.functions.download import download_content
+from custom_components.hacs.helpers.functions.filesystem import async_path_exists
 from custom_components.hacs.helpers.functions.version_to_install import (
     version_to_install,
 )
 from custom_components.hacs.operational.backup import Backup, BackupNetDaemon
+from custom_components.hacs.webresponses.category import clear_stat_cache
 
 
 class RepositoryMethodPreInstall(ABC):
@@ -37,6 +38,7 @@ class RepositoryMethodPostInstall(ABC):
     async def _async_post_install(self) -> None:
         self.logger.info("Running post installation steps")
         await self.async_post_installation()
+        clear_stat_cache()
         self.data.new = False
         self.hacs.hass.bus.async_fire(
             "hacs/repository",
@@ -47,7 +49,9 @@ class RepositoryMethodPostInstall(ABC):
 
 async def async_install_repository(repository):
     """Common installation steps of the repository."""
+    hass = repository.hacs.hass
     persistent_directory = None
+    backup = None
     await repository.update_repository()
     if repository.content.path.local is None:
         raise HacsException("repository.content.path.local is None")
@@ -66,23 +70,36 @@ async def async_install_repository(repository):
 
     if repository.data.installed and repository.data.category == "netdaemon":
         persistent_directory = BackupNetDaemon(repository)
-        persistent_directory.create()
+        await hass.async_add_executor_job(persistent_directory.create)
 
     elif repository.data.persistent_directory:
-        if os.path.exists(
+        if await async_path_exists(
             f"{repository.content.path.local}/{repository.data.persistent_directory}"
         ):
             persistent_directory = Backup(
                 f"{repository.content.path.local}/{repository.data.persistent_directory}",
-                f"{tempfile.gettempdir()}/hacs_persistent_directory/",
+                f"{tempfile.gettempdir()}/hacs_persistent_directory/"
+                f"{repository.data.full_name.replace('/', '_')}/",
             )
-            persistent_directory.create()
-
-    if repository.data.installed and not repository.content.single:
+            await hass.async_add_executor_job(persistent_directory.create)
+
+    zip_release = (
+        repository.data.zip_release and version != repository.data.default_branch
+    )
+    if zip_release:
+        repository.data.installed_files = {}
+
+    # Delta upgrades only replace changed files and keep the rest in place,
+    # download_content backs up and restores just the changed files.
+    if (
+        repository.data.installed
+        and not repository.content.single
+        and not repository.data.installed_files
+    ):
         backup = Backup(repository.content.path.local)
-        backup.create()
+        await hass.async_add_executor_job(backup.create)
 
-    if repository.data.zip_release and version != repository.data.default_branch:
+    if zip_release:
         await repository.download_zip_files(repository)
     else:
         await download_content(repository)
@@ -90,15 +107,15 @@ async def async_install_repository(repository):
     if repository.validate.errors:
         for error in repository.validate.errors:
             repository.logger.error(error)
-        if repository.data.installed and not repository.content.single:
-            backup.restore()
+        if backup is not None:
+            await hass.async_add_executor_job(backup.restore)
 
-    if repository.data.installed and not repository.content.single:
-        backup.cleanup()
+    if backup is not None:
+        await hass.async_add_executor_job(backup.cleanup)
 
     if persistent_directory is not None:
-        persistent_directory.restore()
-        persistent_directory.cleanup()
+        await hass.async_add_executor_job(persistent_directory.restore)
+        await hass.async_add_executor_job(persistent_directory.cleanup)
 
     if repository.validate.success:
         if (
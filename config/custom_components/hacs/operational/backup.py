@@ -4,76 +4,129 @@ from custom_components.hacs.helpers.functions.is_safe_to_remove import is_safe_t
 import os
 import shutil
 import tempfile
-from time import sleep
 
+from custom_components.hacs.helpers.functions.filesystem import remove_path
 from custom_components.hacs.helpers.functions.logger import getLogger
 
-BACKUP_PATH = f"{tempfile.gettempdir()}/hacs_backup/"
-
 
 class Backup:
-    """Backup."""
+    """Backup.
+
+    The backup is made by moving the original out of the way, which is a
+    single rename when both paths are on the same filesystem. Without a
+    backup_path the backup is kept as a hidden sibling of local_path, so
+    creating and restoring it costs the same for any size of install. The
+    methods do blocking I/O, call them in the executor.
+    """
 
-    def __init__(self, local_path, backup_path=BACKUP_PATH):
+    def __init__(self, local_path, backup_path=None):
         """initialize."""
         self.logger = getLogger("backup")
-        self.local_path = local_path
-        self.backup_path = backup_path
-        self.backup_path_full = f"{self.backup_path}{self.local_path.split('/')[-1]}"
+        self.local_path = local_path.rstrip("/")
+        parent, name = os.path.split(self.local_path)
+        if backup_path is None:
+            self.backup_path = f"{parent}/"
+            self.backup_path_full = f"{parent}/.{name}.hacs_backup"
+        else:
+            self.backup_path = backup_path
+            self.backup_path_full = f"{self.backup_path}{name}"
 
     def create(self):
-        """Create a backup in /tmp"""
+        """Move the original to the backup location."""
         if not os.path.exists(self.local_path):
             return
         if not is_safe_to_remove(self.local_path):
             return
-        if os.path.exists(self.backup_path):
-            shutil.rmtree(self.backup_path)
-            while os.path.exists(self.backup_path):
-                sleep(0.1)
+        remove_path(self.backup_path_full)
         os.makedirs(self.backup_path, exist_ok=True)
 
         try:
-            if os.path.isfile(self.local_path):
-                shutil.copyfile(self.local_path, self.backup_path_full)
-                os.remove(self.local_path)
-            else:
-                shutil.copytree(self.local_path, self.backup_path_full)
-                shutil.rmtree(self.local_path)
-                while os.path.exists(self.local_path):
-                    sleep(0.1)
+            shutil.move(self.local_path, self.backup_path_full)
             self.logger.debug(
                 f"Backup for {self.local_path}, created in {self.backup_path_full}"
             )
-        except BaseException:
-            pass
+        except OSError as exception:
+            self.logger.error(f"Could not backup {self.local_path} - {exception}")
 
     def restore(self):
         """Restore from backup."""
         if not os.path.exists(self.backup_path_full):
             return
 
-        if os.path.isfile(self.backup_path_full):
-            if os.path.exists(self.local_path):
-                os.remove(self.local_path)
-            shutil.copyfile(self.backup_path_full, self.local_path)
-        else:
-            if os.path.exists(self.local_path):
-                shutil.rmtree(self.local_path)
-                while os.path.exists(self.local_path):
-                    sleep(0.1)
-            shutil.copytree(self.backup_path_full, self.local_path)
+        remove_path(self.local_path)
+        shutil.move(self.backup_path_full, self.local_path)
         self.logger.debug(
             f"Restored {self.local_path}, from backup {self.backup_path_full}"
         )
 
     def cleanup(self):
         """Cleanup backup files."""
-        if os.path.exists(self.backup_path):
-            shutil.rmtree(self.backup_path)
-            while os.path.exists(self.backup_path):
-                sleep(0.1)
-            self.logger.debug(f"Backup dir {self.backup_path} cleared")
+        if os.path.lexists(self.backup_path_full):
+            remove_path(self.backup_path_full)
+            self.logger.debug(f"Backup {self.backup_path_full} cleared")
+
+
+class BackupFiles:
+    """Backup of single files in local_path, for upgrades that replace only those.
+
+    The files (and their compressed copies) are moved to a hidden sibling of
+    local_path, and files that did not exist are remembered, so restore puts
+    back exactly what was there. The methods do blocking I/O, call them in
+    the executor.
+    """
+
+    def __init__(self, local_path, files):
+        """initialize."""
+        self.logger = getLogger("backup")
+        self.local_path = local_path.rstrip("/")
+        parent, name = os.path.split(self.local_path)
+        self.backup_path_full = f"{parent}/.{name}.hacs_backup"
+        self.paths = [
+            os.path.relpath(f"{filename}{suffix}", self.local_path)
+            for filename in files
+            for suffix in ("", ".gz", ".br")
+        ]
+        self.new_paths = []
+
+    def create(self):
+        """Move the files to the backup location."""
+        remove_path(self.backup_path_full)
+        self.new_paths = []
+        for path in self.paths:
+            source = f"{self.local_path}/{path}"
+            if not os.path.isfile(source):
+                self.new_paths.append(path)
+                continue
+            target = f"{self.backup_path_full}/{path}"
+            try:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.move(source, target)
+            except OSError as exception:
+                self.logger.error(f"Could not backup {source} - {exception}")
+        self.logger.debug(
+            f"Backup for {len(self.paths) - len(self.new_paths)} files in "
+            f"{self.local_path}, created in {self.backup_path_full}"
+        )
+
+    def restore(self):
+        """Restore the files from backup, and remove the ones that were new."""
+        for path in self.paths:
+            local = f"{self.local_path}/{path}"
+            backup = f"{self.backup_path_full}/{path}"
+            if os.path.isfile(backup):
+                os.makedirs(os.path.dirname(local), exist_ok=True)
+                shutil.move(backup, local)
+            elif path in self.new_paths and os.path.isfile(local):
+                os.remove(local)
+        self.logger.debug(
+            f"Restored {self.local_path}, from backup {self.backup_path_full}"
+        )
+
+    def cleanup(self):
+        """Cleanup backup files."""
+        if os.path.lexists(self.backup_path_full):
+            remove_path(self.backup_path_full)
+            self.logger.debug(f"Backup {self.backup_path_full} cleared")
 
 
 class BackupNetDaemon:
@@ -89,10 +142,7 @@ class BackupNetDaemon:
         """Create a backup in /tmp"""
         if not is_safe_to_remove(self.repository.content.path.local):
             return
-        if os.path.exists(self.backup_path):
-            shutil.rmtree(self.backup_path)
-            while os.path.exists(self.backup_path):
-                sleep(0.1)
+        remove_path(self.backup_path)
         os.makedirs(self.backup_path, exist_ok=True)
 
         for filename in os.listdir(self.repository.content.path.local):
@@ -115,7 +165,5 @@ class BackupNetDaemon:
     def cleanup(self):
         """Create a backup in /tmp"""
         if os.path.exists(self.backup_path):
-            shutil.rmtree(self.backup_path)
-            while os.path.exists(self.backup_path):
-                sleep(0.1)
+            remove_path(self.backup_path)
             self.logger.debug(f"Backup dir {self.backup_path} cleared")
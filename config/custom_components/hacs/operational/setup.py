@@ -12,6 +12,9 @@ from custom_components.hacs.const import DOMAIN, ELEMENT_TYPES, STARTUP, VERSION
 from custom_components.hacs.hacsbase.configuration import Configuration
 from custom_components.hacs.hacsbase.data import HacsData
 from custom_components.hacs.helpers.functions.constrains import check_constrains
+from custom_components.hacs.helpers.functions.filesystem import (
+    enable_blocking_io_warnings,
+)
 from custom_components.hacs.helpers.functions.remaining_github_calls import (
     get_fetch_updates_for,
 )
@@ -128,6 +131,8 @@ async def async_hacs_startup():
     hacs.logger.info(STARTUP)
     hacs.system.config_path = hacs.hass.config.path()
     hacs.system.ha_version = HAVERSION
+    if hacs.configuration.debug:
+        enable_blocking_io_warnings()
 
     # Clear old storage files
     await async_clear_storage()
@@ -10,7 +10,12 @@ from custom_components.hacs.api.get_critical_repositories import (
 )
 from custom_components.hacs.api.hacs_config import hacs_config
 from custom_components.hacs.api.hacs_removed import hacs_removed
-from custom_components.hacs.api.hacs_repositories import hacs_repositories
+from custom_components.hacs.api.hacs_repositories import (
+    hacs_repositories,
+    hacs_repositories_query,
+    hacs_repositories_search,
+    hacs_repositories_subscribe,
+)
 from custom_components.hacs.api.hacs_repository import hacs_repository
 from custom_components.hacs.api.hacs_repository_data import hacs_repository_data
 from custom_components.hacs.api.hacs_settings import hacs_settings
@@ -24,6 +29,9 @@ async def async_setup_hacs_websockt_api():
     websocket_api.async_register_command(hass, hacs_settings)
     websocket_api.async_register_command(hass, hacs_config)
     websocket_api.async_register_command(hass, hacs_repositories)
+    websocket_api.async_register_command(hass, hacs_repositories_subscribe)
+    websocket_api.async_register_command(hass, hacs_repositories_query)
+    websocket_api.async_register_command(hass, hacs_repositories_search)
     websocket_api.async_register_command(hass, hacs_repository)
     websocket_api.async_register_command(hass, hacs_repository_data)
     websocket_api.async_register_command(hass, check_local_path)
@@ -3,6 +3,7 @@ from aiogithubapi import AIOGitHubAPIException
 
 from custom_components.hacs.helpers.classes.exceptions import HacsException
 from custom_components.hacs.helpers.classes.repository import HacsRepository
+from custom_components.hacs.helpers.functions.information import get_contents
 from custom_components.hacs.helpers.functions.logger import getLogger
 
 
@@ -30,7 +31,7 @@ class HacsAppdaemon(HacsRepository):
 
         # Custom step 1: Validate content.
         try:
-            addir = await self.repository_object.get_contents("apps", self.ref)
+            addir = await get_contents(self.repository_object, "apps", self.ref)
         except AIOGitHubAPIException:
             raise HacsException(
                 f"Repostitory structure for {self.ref.replace('tags/','')} is not compliant"
@@ -40,8 +41,8 @@ class HacsAppdaemon(HacsRepository):
             self.validate.errors.append("Repostitory structure not compliant")
 
         self.content.path.remote = addir[0].path
-        self.content.objects = await self.repository_object.get_contents(
-            self.content.path.remote, self.ref
+        self.content.objects = await get_contents(
+            self.repository_object, self.content.path.remote, self.ref
         )
 
         # Handle potential errors
@@ -60,12 +61,12 @@ class HacsAppdaemon(HacsRepository):
             self.content.path.remote = ""
 
         if self.content.path.remote == "apps":
-            addir = await self.repository_object.get_contents(
-                self.content.path.remote, self.ref
+            addir = await get_contents(
+                self.repository_object, self.content.path.remote, self.ref
             )
             self.content.path.remote = addir[0].path
-        self.content.objects = await self.repository_object.get_contents(
-            self.content.path.remote, self.ref
+        self.content.objects = await get_contents(
+            self.repository_object, self.content.path.remote, self.ref
         )
 
         # Set local path
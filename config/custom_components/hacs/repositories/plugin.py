@@ -3,7 +3,10 @@ import json
 
 from custom_components.hacs.helpers.classes.exceptions import HacsException
 from custom_components.hacs.helpers.classes.repository import HacsRepository
-from custom_components.hacs.helpers.functions.information import find_file_name
+from custom_components.hacs.helpers.functions.information import (
+    find_file_name,
+    get_contents,
+)
 from custom_components.hacs.helpers.functions.logger import getLogger
 
 
@@ -67,8 +70,8 @@ class HacsPlugin(HacsRepository):
     async def get_package_content(self):
         """Get package content."""
         try:
-            package = await self.repository_object.get_contents(
-                "package.json", self.ref
+            package = await get_contents(
+                self.repository_object, "package.json", self.ref
             )
             if package := json.loads(package.content):
                 self.data.authors = package["author"]
@@ -1,5 +1,6 @@
 """Sensor platform for HACS."""
 # pylint: disable=unused-argument
+from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
 
 from custom_components.hacs.const import DOMAIN, NAME_SHORT, VERSION
@@ -38,23 +39,49 @@ class HACSSensor(HACSDevice):
     def __init__(self):
         """Initialize."""
         self._state = None
-        self.repositories = []
+        self._attributes = {"repositories": []}
+        self._remove_listeners = []
 
-    async def async_update(self):
-        """Update the sensor."""
+    async def async_added_to_hass(self):
+        """Follow the pending updates, and the end of background tasks."""
         hacs = get_hacs()
-        if hacs.system.status.background_task:
+        self._remove_listeners = [
+            hacs.repositories.pending_updates.async_add_listener(self._async_changed),
+            self.hass.bus.async_listen("hacs/status", self._async_changed),
+        ]
+        self._update()
+
+    async def async_will_remove_from_hass(self):
+        """Stop following the pending updates."""
+        for remove_listener in self._remove_listeners:
+            remove_listener()
+        self._remove_listeners = []
+
+    @callback
+    def _async_changed(self, _event=None):
+        """Write the new state, unless a background task is still running."""
+        if get_hacs().system.status.background_task:
             return
+        if self._update():
+            self.async_write_ha_state()
 
-        self.repositories = [
-            repository
-            for repository in hacs.repositories
-            if (
-                repository.pending_upgrade
-                and repository.data.category in hacs.common.categories
-            )
-        ]
-        self._state = len(self.repositories)
+    def _update(self):
+        """Read the pending updates, and return True if they changed."""
+        hacs = get_hacs()
+        repositories = sorted(
+            hacs.repositories.pending_updates.get(hacs.common.categories),
+            key=lambda entry: entry["name"],
+        )
+        if self._state is not None and repositories == self._attributes["repositories"]:
+            return False
+        self._attributes = {"repositories": repositories}
+        self._state = len(repositories)
+        return True
+
+    @property
+    def should_poll(self):
+        """No polling, the state is pushed when it changes."""
+        return False
 
     @property
     def unique_id(self):
@@ -86,13 +113,4 @@ class HACSSensor(HACSDevice):
     @property
     def device_state_attributes(self):
         """Return attributes for the sensor."""
-        repositories = [
-            {
-                "name": repository.data.full_name,
-                "display_name": repository.display_name,
-                "installed_version": repository.display_installed_version,
-                "available_version": repository.display_available_version,
-            }
-            for repository in self.repositories
-        ]
-        return {"repositories": repositories}
+        return self._attributes
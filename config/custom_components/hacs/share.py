@@ -4,7 +4,12 @@ SHARE = {
     "hacs": None,
     "factory": None,
     "queue": None,
-    "removed_repositories": [],
+    "github_cache": None,
+    "ratelimiter": None,
+    "repository_feed": None,
+    "tree_cache": None,
+    "default_lists": None,
+    "removed_repositories": {},
     "rules": {},
 }
 
@@ -34,32 +39,87 @@ def get_factory():
 
 def get_queue():
     if SHARE["queue"] is None:
-        from queueman import QueueManager
+        from custom_components.hacs.helpers.classes.task_queue import HacsTaskQueue
 
-        SHARE["queue"] = QueueManager()
+        SHARE["queue"] = HacsTaskQueue()
 
     return SHARE["queue"]
 
 
+def get_github_cache():
+    if SHARE["github_cache"] is None:
+        from custom_components.hacs.helpers.classes.github_cache import (
+            HacsGitHubCache,
+        )
+
+        SHARE["github_cache"] = HacsGitHubCache()
+
+    return SHARE["github_cache"]
+
+
+def get_ratelimiter():
+    if SHARE["ratelimiter"] is None:
+        from custom_components.hacs.helpers.classes.ratelimit import HacsRateLimiter
+
+        SHARE["ratelimiter"] = HacsRateLimiter()
+
+    return SHARE["ratelimiter"]
+
+
+def get_repository_feed():
+    if SHARE["repository_feed"] is None:
+        from custom_components.hacs.helpers.classes.repository_feed import (
+            HacsRepositoryFeed,
+        )
+
+        SHARE["repository_feed"] = HacsRepositoryFeed()
+
+    return SHARE["repository_feed"]
+
+
+def get_tree_cache():
+    if SHARE["tree_cache"] is None:
+        from custom_components.hacs.helpers.classes.tree_cache import HacsTreeCache
+
+        SHARE["tree_cache"] = HacsTreeCache()
+
+    return SHARE["tree_cache"]
+
+
+def get_default_lists():
+    if SHARE["default_lists"] is None:
+        from custom_components.hacs.helpers.classes.default_lists import (
+            HacsDefaultLists,
+        )
+
+        SHARE["default_lists"] = HacsDefaultLists()
+
+    return SHARE["default_lists"]
+
+
 def is_removed(repository):
-    return repository in [x.repository for x in SHARE["removed_repositories"]]
+    return repository.lower() in SHARE["removed_repositories"]
 
 
 def get_removed(repository):
-    if not is_removed(repository):
+    removed_repo = SHARE["removed_repositories"].get(repository.lower())
+    if removed_repo is None:
         from custom_components.hacs.helpers.classes.removed import RemovedRepository
 
         removed_repo = RemovedRepository()
         removed_repo.repository = repository
-        SHARE["removed_repositories"].append(removed_repo)
-    filter_repos = [
-        x
-        for x in SHARE["removed_repositories"]
-        if x.repository.lower() == repository.lower()
-    ]
+        SHARE["removed_repositories"][repository.lower()] = removed_repo
+
+    return removed_repo
+
 
-    return filter_repos.pop() or None
+def load_removed_repositories(items):
+    for item in items:
+        removed_repo = get_removed(item["repository"])
+        removed_repo.reason = item.get("reason")
+        removed_repo.link = item.get("link")
+        removed_repo.removal_type = item.get("removal_type")
 
 
 def list_removed_repositories():
-    return SHARE["removed_repositories"]
+    return list(SHARE["removed_repositories"].values())
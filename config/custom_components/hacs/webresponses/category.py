@@ -1,11 +1,132 @@
+"""Initialize HACS Web responses"""
+import hashlib
+import mimetypes
+import os
+import time
+
 from aiohttp import web
 
 from custom_components.hacs.helpers.functions.logger import getLogger
-from custom_components.hacs.helpers.functions.path_exsist import async_path_exsist
 from custom_components.hacs.share import get_hacs
 
+# Preferred first, the identity (None) variant is always available.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+STAT_CACHE_TTL = 30
+CACHE_CONTROL_VERSIONED = "public, max-age=31536000, immutable"
+CACHE_CONTROL_THEMES = "public, max-age=2678400"
+CACHE_CONTROL_DEFAULT = "no-cache"
+
+STAT_CACHE = {}
+
+
+class StaticFile:
+    """What is known about a file that can be served, and its variants."""
+
+    def __init__(self, path, mtime, size, digest, variants, checked):
+        self.path = path
+        self.mtime = mtime
+        self.size = size
+        self.digest = digest
+        self.variants = variants
+        self.checked = checked
+        self.content_type = (
+            mimetypes.guess_type(path)[0] or "application/octet-stream"
+        )
+
+    def etag(self, encoding):
+        """Return the strong ETag of a variant."""
+        if encoding is None:
+            return f'"{self.digest}"'
+        return f'"{self.digest}-{encoding}"'
+
+
+class ContentFileResponse(web.FileResponse):
+    """FileResponse that keeps the content ETag it was created with.
+
+    Newer aiohttp versions set an ETag from mtime and size while preparing a
+    FileResponse, which would replace the strong ETag from the content hash.
+    """
+
+    @property
+    def etag(self):
+        """Return the ETag header."""
+        return self.headers.get("ETag")
+
+    @etag.setter
+    def etag(self, value):
+        """Keep the ETag set in the headers."""
+
+
+def clear_stat_cache():
+    """Forget what is known about the served files, after they changed."""
+    STAT_CACHE.clear()
+
+
+def load_static_file(path, previous=None):
+    """Stat a file and its compressed variants, return a StaticFile or None."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
 
-async def async_serve_category_file(requested_file):
+    if (
+        previous is not None
+        and previous.mtime == stat.st_mtime_ns
+        and previous.size == stat.st_size
+    ):
+        digest = previous.digest
+    else:
+        sha1 = hashlib.sha1()
+        with open(path, "rb") as source:
+            for chunk in iter(lambda: source.read(64 * 1024), b""):
+                sha1.update(chunk)
+        digest = sha1.hexdigest()
+
+    variants = {}
+    for encoding, suffix in ENCODINGS:
+        try:
+            variant = os.stat(f"{path}{suffix}")
+        except OSError:
+            continue
+        # A variant older than the file was not made from this content.
+        if variant.st_mtime_ns >= stat.st_mtime_ns:
+            variants[encoding] = f"{path}{suffix}"
+
+    return StaticFile(
+        path, stat.st_mtime_ns, stat.st_size, digest, variants, time.monotonic()
+    )
+
+
+def accepted_encodings(header):
+    """Return the content codings an Accept-Encoding header allows."""
+    accepted = set()
+    for item in (header or "").split(","):
+        coding, _, params = item.partition(";")
+        name, _, value = params.partition("=")
+        try:
+            quality = float(value) if name.strip() == "q" else 1
+        except ValueError:
+            quality = 1
+        if quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+async def async_get_static_file(path):
+    """Return the StaticFile for a path, from the cache when it is fresh."""
+    hass = get_hacs().hass
+    cached = STAT_CACHE.get(path)
+    if cached is not None and time.monotonic() - cached.checked < STAT_CACHE_TTL:
+        return cached
+    static_file = await hass.async_add_executor_job(load_static_file, path, cached)
+    if static_file is None:
+        STAT_CACHE.pop(path, None)
+    else:
+        STAT_CACHE[path] = static_file
+    return static_file
+
+
+async def async_serve_category_file(request, requested_file):
     hacs = get_hacs()
     logger = getLogger("web.category")
     try:
@@ -14,21 +135,43 @@ async def async_serve_category_file(requested_file):
         else:
             servefile = f"{hacs.system.config_path}/www/community/{requested_file}"
 
-        # Serve .gz if it exist
-        if await async_path_exsist(f"{servefile}.gz"):
-            servefile += ".gz"
-
-        if await async_path_exsist(servefile):
-            logger.debug(f"Serving {requested_file} from {servefile}")
-            response = web.FileResponse(servefile)
-            if requested_file.startswith("themes/"):
-                response.headers["Cache-Control"] = "public, max-age=2678400"
-            else:
-                response.headers["Cache-Control"] = "no-store, max-age=0"
-                response.headers["Pragma"] = "no-store"
-            return response
-        else:
+        static_file = await async_get_static_file(servefile)
+        if static_file is None:
             logger.error(f"Tried to serve up '{servefile}' but it does not exist")
+            return web.Response(status=404)
+
+        accepted = accepted_encodings(request.headers.get("Accept-Encoding"))
+        encoding = next(
+            (
+                encoding
+                for encoding, _ in ENCODINGS
+                if encoding in accepted and encoding in static_file.variants
+            ),
+            None,
+        )
+
+        headers = {"ETag": static_file.etag(encoding), "Vary": "Accept-Encoding"}
+        if "hacstag" in request.query:
+            headers["Cache-Control"] = CACHE_CONTROL_VERSIONED
+        elif requested_file.startswith("themes/"):
+            headers["Cache-Control"] = CACHE_CONTROL_THEMES
+        else:
+            headers["Cache-Control"] = CACHE_CONTROL_DEFAULT
+
+        if_none_match = request.headers.get("If-None-Match", "")
+        if headers["ETag"] in [tag.strip() for tag in if_none_match.split(",")]:
+            return web.Response(status=304, headers=headers)
+
+        logger.debug(f"Serving {requested_file} from {servefile} ({encoding})")
+        # FileResponse streams the file (with sendfile where it can) and
+        # handles Range and HEAD requests. The content type is the one of the
+        # file, also for a compressed variant.
+        headers["Content-Type"] = static_file.content_type
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return ContentFileResponse(
+            static_file.variants.get(encoding, servefile), headers=headers
+        )
 
     except BaseException as exception:
         logger.debug(